@@ -0,0 +1,77 @@
+"""
+Measures consolidation of a directory of output packages into a team summary.
+
+PDFs are rendered once per contractor and reused, since only reading speed is being
+measured. Every package gets its own sessions, invoice id and manifest, because
+consolidation counts copies of the same package only once.
+
+Usage: python -m benchmarks.bench_consolidate [packages] [contractors]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import datetime, timedelta
+
+from core.session import Session, SessionEndReason
+from output.consolidate import consolidate_packages
+from output.generator import OutputGenerator
+from output.manifest import MANIFEST_NAME, build_manifest
+
+SESSIONS_PER_PACKAGE = 40
+
+
+def build_sessions(offset: int):
+    sessions = []
+    start = datetime(2026, 1, 1, 8, 0, 0) + timedelta(days=offset)
+    for i in range(SESSIONS_PER_PACKAGE):
+        session = Session(start_time=start + timedelta(hours=i), task=f"Task {i}")
+        session.end(session.start_time + timedelta(minutes=50), SessionEndReason.USER_STOPPED)
+        sessions.append(session)
+    return sessions
+
+
+def main():
+    packages = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    contractors = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        generator = OutputGenerator()
+        templates = []
+        for i in range(contractors):
+            path = os.path.join(temp_dir, f"template_{i}.zip.tmp")
+            generator.generate_package(build_sessions(i), path, user_name=f"Contractor {i:03d}", hourly_rate=500.0)
+            with zipfile.ZipFile(path) as template:
+                templates.append((template.read("invoice.pdf"), template.read("administrative_record.pdf")))
+
+        package_dir = os.path.join(temp_dir, "packages")
+        os.mkdir(package_dir)
+        for i in range(packages):
+            contractor = i % contractors
+            invoice_pdf, admin_pdf = templates[contractor]
+            manifest = build_manifest(build_sessions(i), f"Contractor {contractor:03d}", 500.0, datetime.now(),
+                                      invoice_id=f"INV-{i:05d}")
+            with zipfile.ZipFile(os.path.join(package_dir, f"package_{i:05d}.zip"), "w",
+                                 compression=zipfile.ZIP_DEFLATED) as zf:
+                zf.writestr("invoice.pdf", invoice_pdf)
+                zf.writestr("administrative_record.pdf", admin_pdf)
+                zf.writestr(MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False))
+
+        started = time.perf_counter()
+        summary = consolidate_packages(package_dir)
+        scan_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        generator.generate_team_report(summary, os.path.join(temp_dir, "team_report.pdf"))
+        report_seconds = time.perf_counter() - started
+
+    print(f"{summary.package_count:,} packages from {len(summary.contractors)} contractors "
+          f"({SESSIONS_PER_PACKAGE} sessions each), {len(summary.invalid_packages)} invalid or duplicate")
+    print(f"scan + verify: {scan_seconds:.2f}s ({packages / scan_seconds:,.0f} packages/s)")
+    print(f"team report:   {report_seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
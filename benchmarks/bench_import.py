@@ -0,0 +1,59 @@
+"""
+Measures streaming import speed and peak memory for a generated CSV timesheet.
+
+Usage: python -m benchmarks.bench_import [rows]
+"""
+import csv
+import os
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from storage.history import SessionHistory
+from storage.importer import import_sessions
+
+REJECT_EVERY = 1000  # One in this many generated rows is invalid
+DUPLICATE_EVERY = 500  # One in this many generated rows repeats the previous row
+
+
+def write_csv(path: str, rows: int) -> None:
+    start = datetime(2015, 1, 1, 8, 0, 0)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["start_time", "end_time", "task", "end_reason"])
+        previous = None
+        for i in range(rows):
+            if previous and i % DUPLICATE_EVERY == 0:
+                writer.writerow(previous)
+                continue
+            session_start = start + timedelta(minutes=10 * i)
+            session_end = session_start + timedelta(minutes=5)
+            if i % REJECT_EVERY == 1:
+                session_end = session_start
+            previous = [session_start.isoformat(), session_end.isoformat(), f"Task {i % 37}", "USER_STOPPED"]
+            writer.writerow(previous)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_path = os.path.join(temp_dir, "timesheet.csv")
+        write_csv(csv_path, rows)
+        history = SessionHistory(os.path.join(temp_dir, "history.sqlite3"))
+
+        rss_before_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        started = time.perf_counter()
+        report = import_sessions(csv_path, history, rejects_path=os.path.join(temp_dir, "rejects.csv"))
+        elapsed = time.perf_counter() - started
+        rss_after_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        history.close()
+
+    print(f"{report.rows_read:,} rows in {elapsed:.1f}s ({report.rows_read / elapsed:,.0f} rows/s)")
+    print(f"imported {report.imported:,}, duplicates {report.duplicates:,}, rejected {report.rejected:,}")
+    print(f"peak RSS {rss_after_kb / 1024:.0f} MB (before import {rss_before_kb / 1024:.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
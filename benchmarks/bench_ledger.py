@@ -0,0 +1,87 @@
+"""
+Compares config.json save/load with all invoiced history kept in it against a small
+hot set plus the invoice ledger, and measures auditor queries on the ledger.
+
+Usage: python -m benchmarks.bench_ledger [years] [sessions_per_week]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from core.session import Session, SessionEndReason
+from storage.ledger import InvoiceLedger
+
+REPEATS = 20  # Save/load timings are averaged over this many runs
+
+
+def build_week(week_start: datetime, count: int):
+    sessions = []
+    for i in range(count):
+        session = Session(start_time=week_start + timedelta(hours=2 * i), task=f"Task {i % 11}")
+        session.end(session.start_time + timedelta(minutes=90), SessionEndReason.USER_STOPPED)
+        sessions.append(session)
+    return sessions
+
+
+def time_config_round_trip(path: str, sessions):
+    started = time.perf_counter()
+    for _ in range(REPEATS):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"completed_sessions": [s.to_dict() for s in sessions]}, f)
+    save_seconds = (time.perf_counter() - started) / REPEATS
+
+    started = time.perf_counter()
+    for _ in range(REPEATS):
+        with open(path, "r", encoding="utf-8") as f:
+            [Session.from_dict(d) for d in json.load(f)["completed_sessions"]]
+    load_seconds = (time.perf_counter() - started) / REPEATS
+    return save_seconds, load_seconds
+
+
+def main():
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    per_week = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    weeks = years * 52
+    start = datetime(2021, 1, 4, 8, 0, 0)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        history = []
+        ledger = InvoiceLedger(os.path.join(temp_dir, "ledger"))
+        started = time.perf_counter()
+        for week in range(weeks):
+            week_start = start + timedelta(weeks=week)
+            sessions = build_week(week_start, per_week)
+            history.extend(sessions)
+            invoice_time = week_start + timedelta(days=6)
+            ledger.seal(f"INV-{week:04d}", sessions, sealed_at=invoice_time)
+            ledger.compact(before=invoice_time)
+        seal_seconds = (time.perf_counter() - started) / weeks
+        hot_set = build_week(start + timedelta(weeks=weeks), per_week)
+
+        config_path = os.path.join(temp_dir, "config.json")
+        full_save, full_load = time_config_round_trip(config_path, history + hot_set)
+        hot_save, hot_load = time_config_round_trip(config_path, hot_set)
+
+        reopened = InvoiceLedger(os.path.join(temp_dir, "ledger"))
+        started = time.perf_counter()
+        invoice = reopened.get_invoice(f"INV-{weeks // 2:04d}")
+        invoice_seconds = time.perf_counter() - started
+        month_start = start + timedelta(weeks=weeks // 2)
+        started = time.perf_counter()
+        month = list(reopened.query_period(month_start, month_start + timedelta(days=30)))
+        period_seconds = time.perf_counter() - started
+        segment_count = len(os.listdir(os.path.join(temp_dir, "ledger", "segments")))
+
+    print(f"{years} years, {weeks} weekly invoices, {len(history):,} invoiced sessions, {segment_count} segments")
+    print(f"config.json with all history: save {full_save * 1000:7.1f} ms, load {full_load * 1000:7.1f} ms")
+    print(f"config.json with hot set:     save {hot_save * 1000:7.1f} ms, load {hot_load * 1000:7.1f} ms")
+    print(f"seal + compact per export:    {seal_seconds * 1000:.1f} ms")
+    print(f"audit one invoice:            {invoice_seconds * 1000:.1f} ms ({len(invoice)} sessions)")
+    print(f"audit a 30-day period:        {period_seconds * 1000:.1f} ms ({len(month)} sessions)")
+
+
+if __name__ == "__main__":
+    main()
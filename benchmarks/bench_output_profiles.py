@@ -0,0 +1,48 @@
+"""
+Compares package size against generation time for each output profile.
+
+Usage: python -m benchmarks.bench_output_profiles [session_count]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from core.session import Session, SessionEndReason
+from output.generator import OutputGenerator, OUTPUT_PROFILES
+
+REPEATS = 5  # Each profile is timed over this many runs; the best run is reported
+
+
+def build_sessions(count: int):
+    sessions = []
+    start = datetime(2026, 1, 1, 8, 0, 0)
+    for i in range(count):
+        session = Session(start_time=start + timedelta(hours=i), task=f"Task {i % 17}")
+        session.end(session.start_time + timedelta(minutes=45), SessionEndReason.USER_STOPPED)
+        sessions.append(session)
+    return sessions
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    sessions = build_sessions(count)
+
+    print(f"{count} sessions, best of {REPEATS} runs")
+    print(f"{'profile':<10} {'size (bytes)':>14} {'time (ms)':>10}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for profile in OUTPUT_PROFILES:
+            generator = OutputGenerator(profile=profile)
+            output_path = os.path.join(temp_dir, f"{profile}.zip")
+            best = None
+            for _ in range(REPEATS):
+                started = time.perf_counter()
+                generator.generate_package(sessions, output_path, hourly_rate=500.0)
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            print(f"{profile:<10} {os.path.getsize(output_path):>14,} {best * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
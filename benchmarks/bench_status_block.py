@@ -0,0 +1,42 @@
+"""
+Measures how often a reader can poll the live status block, and the writer's cost per publish.
+
+Usage: python -m benchmarks.bench_status_block [reads]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from status.block import StatusBlockReader, StatusBlockWriter, STATE_ACTIVE
+
+
+def main():
+    reads = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "status.bin")
+        writer = StatusBlockWriter(path)
+        session_start = datetime(2026, 1, 1, 9, 0, 0)
+
+        started = time.perf_counter()
+        for i in range(reads):
+            writer.publish(STATE_ACTIVE, task="Benchmark", session_start=session_start, inactivity_seconds=i % 300,
+                           max_inactivity_seconds=300, today_total_seconds=i, updated_at=session_start)
+        publish_seconds = time.perf_counter() - started
+
+        reader = StatusBlockReader(path)
+        started = time.perf_counter()
+        for _ in range(reads):
+            reader.read()
+        read_seconds = time.perf_counter() - started
+        reader.close()
+        writer.close()
+
+    print(f"publish: {publish_seconds / reads * 1e6:.2f} us per write")
+    print(f"read:    {read_seconds / reads * 1e6:.2f} us per read ({reads / read_seconds:,.0f} reads/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compares rapid task switching through switch_task against Stop followed by Start.
+
+Each switch is persisted the way the app does it: one config.json rewrite per
+ended session plus the crash checkpoint update.
+
+Usage: python -m benchmarks.bench_switch_task [switches]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from core.engine import CoreEngine
+from storage.checkpoint import SessionCheckpoint
+
+
+def save_config(engine: CoreEngine, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"completed_sessions": [s.to_dict() for s in engine.completed_sessions]}, f)
+
+
+def run(switches: int, temp_dir: str, use_switch_task: bool):
+    config_path = os.path.join(temp_dir, "config.json")
+    checkpoint = SessionCheckpoint(os.path.join(temp_dir, "active_session.chk"))
+    engine = CoreEngine()
+    start = datetime(2026, 1, 1, 8, 0, 0)
+    engine.start_session(task="Task 0", start_time=start)
+    checkpoint.write_session(engine.active_session)
+
+    gaps = 0
+    started = time.perf_counter()
+    for i in range(1, switches + 1):
+        if use_switch_task:
+            engine.switch_task(f"Task {i}", switch_time=start + timedelta(seconds=i))
+            save_config(engine, config_path)
+            checkpoint.write_session(engine.active_session)
+        else:
+            engine.stop_session(stop_time=start + timedelta(seconds=i))
+            save_config(engine, config_path)
+            checkpoint.clear()
+            # Stop and Start are separate clicks, so they never share a timestamp.
+            engine.start_session(task=f"Task {i}", start_time=start + timedelta(seconds=i, milliseconds=1))
+            checkpoint.write_session(engine.active_session)
+        engine.dispatch_events()
+    elapsed = time.perf_counter() - started
+    checkpoint.close()
+
+    sessions = engine.completed_sessions + [engine.active_session]
+    for previous, following in zip(sessions, sessions[1:]):
+        if previous.end_time != following.start_time:
+            gaps += 1
+    return elapsed, gaps
+
+
+def main():
+    switches = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for label, use_switch_task in (("stop + start", False), ("switch_task", True)):
+            elapsed, gaps = run(switches, temp_dir, use_switch_task)
+            print(f"{label:<13} {switches} switches in {elapsed * 1000:8.1f} ms "
+                  f"({elapsed / switches * 1e6:7.1f} us/switch), {gaps} gaps between sessions")
+
+
+if __name__ == "__main__":
+    main()
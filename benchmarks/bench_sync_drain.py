@@ -0,0 +1,55 @@
+"""
+Measures outbox throughput: enqueue N sessions, then drain them to the local stand-in server.
+
+Usage: python -m benchmarks.bench_sync_drain [session_count] [batch_size]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from core.session import Session, SessionEndReason
+from sync.local_server import LocalSyncServer
+from sync.outbox import SyncOutbox
+from sync.transport import HttpTransport
+from sync.uploader import SyncUploader
+
+
+def generate_sessions(count: int):
+    start = datetime(2020, 1, 1, 8, 0, 0)
+    for i in range(count):
+        session = Session(start_time=start + timedelta(minutes=i), task=f"Task {i % 23}")
+        session.end(session.start_time + timedelta(seconds=50), SessionEndReason.USER_STOPPED)
+        yield session
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        outbox = SyncOutbox(os.path.join(temp_dir, "outbox.sqlite3"))
+        started = time.perf_counter()
+        outbox.enqueue_many(generate_sessions(count), "Bench User")
+        enqueue_seconds = time.perf_counter() - started
+
+        server = LocalSyncServer().start()
+        transport = HttpTransport(server.url)
+        uploader = SyncUploader(outbox, transport, batch_size=batch_size)
+        started = time.perf_counter()
+        report = uploader.drain()
+        drain_seconds = time.perf_counter() - started
+        transport.close()
+        server.stop()
+        outbox.close()
+
+    print(f"enqueued {count:,} sessions in {enqueue_seconds:.1f}s ({count / enqueue_seconds:,.0f}/s)")
+    print(f"drained {report.sent_sessions:,} sessions in {report.sent_batches:,} batches "
+          f"over {server.requests_received:,} requests in {drain_seconds:.1f}s "
+          f"({report.sent_sessions / drain_seconds:,.0f}/s)")
+    print(f"server stored {len(server.records):,} unique sessions")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,15 @@
+import threading
 from datetime import datetime
 from enum import Enum, auto
-from typing import Optional, List
+from typing import Callable, Optional, List
+from core.events import EngineEvent, EngineEventType
 from core.session import Session, SessionEndReason
 
 # Authoritative constants from docs/03_system_core.md and docs/02_definition_of_terms.md
 MAX_INACTIVITY_SECONDS = 300  # 5 minutes
+INACTIVITY_WARNING_SECONDS = 120  # Warning is raised once inactivity exceeds 2 minutes
+
+EventSubscriber = Callable[[List[EngineEvent]], None]
 
 
 class SystemState(Enum):
@@ -24,6 +29,42 @@ class CoreEngine:
         self.completed_sessions: List[Session] = []
         self.inactivity_timer_seconds: int = 0
         self._last_tick_time: Optional[datetime] = None
+        self._inactivity_warning_raised: bool = False
+        self._subscribers: List[EventSubscriber] = []
+        self._pending_events: List[EngineEvent] = []
+        self._events_lock = threading.Lock()
+
+    def subscribe(self, subscriber: EventSubscriber) -> None:
+        """
+        Registers a callback that receives each batch of events from dispatch_events().
+        Callbacks run on the thread calling dispatch_events(); to hand events to
+        another thread or an asyncio loop, pass e.g. `queue.put` or a function using
+        `loop.call_soon_threadsafe`.
+        """
+        self._subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber: EventSubscriber) -> None:
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+
+    def dispatch_events(self) -> None:
+        """
+        Delivers all events queued since the last dispatch, as one batch per subscriber.
+        """
+        with self._events_lock:
+            batch = self._pending_events
+            self._pending_events = []
+
+        if not batch:
+            return
+
+        for subscriber in list(self._subscribers):
+            subscriber(batch)
+
+    def _queue_event(self, event: EngineEvent) -> None:
+        # Events may be queued from input listener threads.
+        with self._events_lock:
+            self._pending_events.append(event)
 
     def start_session(self, task: str = "", start_time: Optional[datetime] = None) -> None:
         """
@@ -36,8 +77,10 @@ class CoreEngine:
         now = start_time or datetime.now()
         self.active_session = Session(start_time=now, task=task)
         self.inactivity_timer_seconds = 0
+        self._inactivity_warning_raised = False
         self._last_tick_time = now
         self.state = SystemState.ACTIVE
+        self._queue_event(EngineEvent(EngineEventType.SESSION_STARTED, now, self.active_session))
 
     def stop_session(self, stop_time: Optional[datetime] = None) -> None:
         """
@@ -50,20 +93,55 @@ class CoreEngine:
         now = stop_time or datetime.now()
         self.active_session.end(now, SessionEndReason.USER_STOPPED)
         self.completed_sessions.append(self.active_session)
+        self._queue_event(EngineEvent(
+            EngineEventType.SESSION_ENDED, now, self.active_session, SessionEndReason.USER_STOPPED
+        ))
         
         self.active_session = None
         self.state = SystemState.IDLE
         self._last_tick_time = None
 
-    def handle_input(self) -> None:
+    def switch_task(self, task: str, switch_time: Optional[datetime] = None) -> None:
+        """
+        Ends the active session and starts the next one at exactly the same timestamp.
+        The inactivity timer carries over, since switching tasks is not itself input.
+        If IDLE, action is silently ignored.
         """
-        Any mouse or keyboard input resets the inactivity timer to zero.
+        if self.state == SystemState.IDLE or not self.active_session:
+            return
+
+        now = switch_time or datetime.now()
+        previous_session = self.active_session
+        previous_session.end(now, SessionEndReason.USER_STOPPED)
+        self.completed_sessions.append(previous_session)
+
+        # _last_tick_time is kept so the next tick accrues inactivity across the switch.
+        self.active_session = Session(start_time=now, task=task)
+        self._queue_event(EngineEvent(
+            EngineEventType.SESSION_ENDED, now, previous_session, SessionEndReason.USER_STOPPED
+        ))
+        self._queue_event(EngineEvent(EngineEventType.SESSION_STARTED, now, self.active_session))
+
+    def handle_input(self, input_time: Optional[datetime] = None) -> None:
+        """
+        Any mouse or keyboard input resets the inactivity timer to zero
+        and marks the current minute as active in the session timeline.
         Ref: docs/03_system_core.md
         """
-        import threading
-        # Ensure thread-safety if called from pynput listener threads
+        # May be called from pynput listener threads; only simple assignments happen here.
         self.inactivity_timer_seconds = 0
 
+        session = self.active_session
+        if not session:
+            return
+
+        now = input_time or datetime.now()
+        session.mark_activity(now)
+
+        if self._inactivity_warning_raised:
+            self._inactivity_warning_raised = False
+            self._queue_event(EngineEvent(EngineEventType.INPUT_RESUMED, now, session))
+
     def tick(self, current_time: Optional[datetime] = None) -> None:
         """
         Updates the inactivity timer and checks for maximum inactivity limit.
@@ -83,6 +161,11 @@ class CoreEngine:
 
         if self.inactivity_timer_seconds >= MAX_INACTIVITY_SECONDS:
             self._handle_inactivity_limit_reached(now)
+            return
+
+        if self.inactivity_timer_seconds > INACTIVITY_WARNING_SECONDS and not self._inactivity_warning_raised:
+            self._inactivity_warning_raised = True
+            self._queue_event(EngineEvent(EngineEventType.INACTIVITY_WARNING, now, self.active_session))
 
     def _handle_inactivity_limit_reached(self, end_time: datetime) -> None:
         """
@@ -93,12 +176,18 @@ class CoreEngine:
             return
 
         # SESSION END TIME is set at the moment the inactivity limit is reached.
+        # After a task switch the timer may have started counting in the previous
+        # session, so only the part within this session is recorded.
+        session_seconds = max(int((end_time - self.active_session.start_time).total_seconds()), 0)
         self.active_session.end(
             end_time, 
             SessionEndReason.INACTIVITY_LIMIT, 
-            inactivity_seconds=self.inactivity_timer_seconds
+            inactivity_seconds=min(self.inactivity_timer_seconds, session_seconds)
         )
         self.completed_sessions.append(self.active_session)
+        self._queue_event(EngineEvent(
+            EngineEventType.SESSION_ENDED, end_time, self.active_session, SessionEndReason.INACTIVITY_LIMIT
+        ))
         
         self.active_session = None
         self.state = SystemState.IDLE
@@ -115,7 +204,32 @@ class CoreEngine:
         now = interruption_time or datetime.now()
         self.active_session.end(now, SessionEndReason.APP_INTERRUPTION)
         self.completed_sessions.append(self.active_session)
+        self._queue_event(EngineEvent(
+            EngineEventType.SESSION_ENDED, now, self.active_session, SessionEndReason.APP_INTERRUPTION
+        ))
         
         self.active_session = None
         self.state = SystemState.IDLE
         self._last_tick_time = None
+
+    def recover_interrupted_session(self, start_time: datetime, task: str, last_activity_time: datetime) -> None:
+        """
+        Closes a session left open by a crash, using the last checkpointed activity time.
+        Only applies while IDLE, since recovery happens before any new session starts.
+        Skipped if the session was already saved as completed before the crash.
+        Ref: docs/03_system_core.md
+        """
+        if self.state != SystemState.IDLE:
+            return
+
+        # The checkpoint may hold a truncated task, so it is matched as a prefix.
+        for completed in self.completed_sessions:
+            if completed.start_time == start_time and completed.task.startswith(task):
+                return
+
+        session = Session(start_time=start_time, task=task)
+        session.end(last_activity_time, SessionEndReason.APP_INTERRUPTION)
+        self.completed_sessions.append(session)
+        self._queue_event(EngineEvent(
+            EngineEventType.SESSION_ENDED, last_activity_time, session, SessionEndReason.APP_INTERRUPTION
+        ))
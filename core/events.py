@@ -0,0 +1,35 @@
+from datetime import datetime
+from enum import Enum, auto
+from typing import Optional
+
+from core.session import Session, SessionEndReason
+
+
+class EngineEventType(Enum):
+    SESSION_STARTED = auto()
+    SESSION_ENDED = auto()
+    INACTIVITY_WARNING = auto()
+    INPUT_RESUMED = auto()
+
+
+class EngineEvent:
+    """
+    A notification published by the CoreEngine when something meaningful happens.
+    `reason` is set only for SESSION_ENDED events.
+    Ref: docs/03_system_core.md
+    """
+
+    def __init__(
+        self,
+        event_type: EngineEventType,
+        time: datetime,
+        session: Optional[Session] = None,
+        reason: Optional[SessionEndReason] = None,
+    ):
+        self.type: EngineEventType = event_type
+        self.time: datetime = time
+        self.session: Optional[Session] = session
+        self.reason: Optional[SessionEndReason] = reason
+
+    def __repr__(self) -> str:
+        return f"EngineEvent({self.type.name}, {self.time.isoformat()}, reason={self.reason})"
@@ -1,3 +1,4 @@
+import base64
 from datetime import datetime
 from enum import Enum
 from typing import Optional, Dict, Any
@@ -21,6 +22,10 @@ class Session:
         self.task: str = task
         self.end_reason: Optional[SessionEndReason] = None
         self.max_inactivity_reached_seconds: int = 0
+        # One bit per minute since SESSION START TIME; a set bit means input was seen
+        # during that minute. An 8-hour session needs 60 bytes.
+        self.activity_mask: bytearray = bytearray()
+        self._last_marked_minute: int = -1
         self._is_immutable: bool = False
 
     def end(self, end_time: datetime, reason: SessionEndReason, inactivity_seconds: int = 0):
@@ -32,6 +37,37 @@ class Session:
         self.max_inactivity_reached_seconds = inactivity_seconds
         self._is_immutable = True
 
+    def mark_activity(self, activity_time: datetime) -> None:
+        """
+        Records that input occurred during the minute containing activity_time.
+        Constant work per call, so it can be driven directly by input events.
+        """
+        if self._is_immutable:
+            return
+
+        minute = int((activity_time - self.start_time).total_seconds()) // 60
+        if minute == self._last_marked_minute or minute < 0:
+            return
+
+        byte_index, bit = divmod(minute, 8)
+        if byte_index >= len(self.activity_mask):
+            self.activity_mask.extend(bytes(byte_index + 1 - len(self.activity_mask)))
+        self.activity_mask[byte_index] |= 1 << bit
+        self._last_marked_minute = minute
+
+    def get_active_minutes(self) -> int:
+        """
+        Number of minutes within the session in which input was detected.
+        """
+        return sum(bin(b).count("1") for b in self.activity_mask)
+
+    def get_idle_minutes(self) -> int:
+        """
+        Started minutes of SESSION TIME without any detected input.
+        """
+        total_minutes = -(-self.get_duration_seconds() // 60)
+        return max(total_minutes - self.get_active_minutes(), 0)
+
     @property
     def is_complete(self) -> bool:
         return self._is_immutable
@@ -53,6 +89,7 @@ class Session:
             "task": self.task,
             "end_reason": self.end_reason.value if self.end_reason else None,
             "max_inactivity_reached_seconds": self.max_inactivity_reached_seconds,
+            "activity_mask": base64.b64encode(bytes(self.activity_mask)).decode("ascii"),
             "is_immutable": self._is_immutable
         }
 
@@ -65,5 +102,6 @@ class Session:
         if data.get("end_reason"):
             session.end_reason = SessionEndReason(data["end_reason"])
         session.max_inactivity_reached_seconds = data.get("max_inactivity_reached_seconds", 0)
+        session.activity_mask = bytearray(base64.b64decode(data.get("activity_mask", "")))
         session._is_immutable = data.get("is_immutable", False)
         return session
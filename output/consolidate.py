@@ -0,0 +1,147 @@
+import json
+import os
+import sys
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from output.generator import OutputGenerator
+from output.manifest import MANIFEST_NAME, verify_manifest
+
+
+class ContractorTotals:
+    """
+    Totals for one contractor across all of their packages.
+    """
+
+    def __init__(self, user_name: str):
+        self.user_name: str = user_name
+        self.package_count: int = 0
+        self.session_count: int = 0
+        self.total_seconds: int = 0
+        self.amount_to_be_paid: float = 0.0
+        self.period_start: Optional[str] = None
+        self.period_end: Optional[str] = None
+
+    def add(self, manifest: Dict[str, Any]) -> None:
+        self.package_count += 1
+        self.session_count += manifest["session_count"]
+        self.total_seconds += manifest["total_seconds"]
+        self.amount_to_be_paid += manifest["amount_to_be_paid"]
+        if manifest["period_start"] and (self.period_start is None or manifest["period_start"] < self.period_start):
+            self.period_start = manifest["period_start"]
+        if manifest["period_end"] and (self.period_end is None or manifest["period_end"] > self.period_end):
+            self.period_end = manifest["period_end"]
+
+
+class TeamSummary:
+    """
+    Combined totals of a directory of output packages.
+    `invalid_packages` lists (file name, reason) for packages left out of the totals,
+    including repeated copies of a package that was already counted.
+    """
+
+    def __init__(self):
+        self.contractors: Dict[str, ContractorTotals] = {}
+        self.invalid_packages: List[Tuple[str, str]] = []
+
+    @property
+    def package_count(self) -> int:
+        return sum(c.package_count for c in self.contractors.values())
+
+    @property
+    def total_seconds(self) -> int:
+        return sum(c.total_seconds for c in self.contractors.values())
+
+    @property
+    def amount_to_be_paid(self) -> float:
+        return round(sum(c.amount_to_be_paid for c in self.contractors.values()), 2)
+
+
+def read_package_manifest(package_path: Path) -> Dict[str, Any]:
+    """
+    Reads and verifies the manifest of one package, without touching its PDFs.
+    Raises ValueError if the package has no valid manifest.
+    """
+    try:
+        with zipfile.ZipFile(package_path) as zf:
+            manifest = json.loads(zf.read(MANIFEST_NAME))
+    except KeyError:
+        raise ValueError("package has no manifest")
+    except (zipfile.BadZipFile, zlib.error, EOFError, OSError) as e:
+        raise ValueError(f"unreadable package: {e}")
+    except json.JSONDecodeError:
+        raise ValueError("manifest is not valid JSON")
+
+    try:
+        verify_manifest(manifest)
+    except (KeyError, TypeError, IndexError) as e:
+        raise ValueError(f"manifest is incomplete: {e}")
+    return manifest
+
+
+def _read_or_error(package_path: Path) -> Tuple[Path, Optional[Dict[str, Any]], str]:
+    try:
+        return package_path, read_package_manifest(package_path), ""
+    except ValueError as e:
+        return package_path, None, str(e)
+
+
+def package_key(manifest: Dict[str, Any]) -> Tuple[str, Optional[str], str]:
+    """
+    Identifies the invoice a package carries, whatever its file name.
+    Copies of the same package (or a re-export of the same sessions under the same invoice id) share a key.
+    """
+    return manifest["user_name"], manifest.get("invoice_id"), manifest["row_digest"]
+
+
+def consolidate_packages(directory: Path, max_workers: Optional[int] = None) -> TeamSummary:
+    """
+    Scans a directory of output packages in parallel and combines their manifests.
+    Packages with a missing or inconsistent manifest are reported, not counted.
+    A package already counted under another file name is reported as a duplicate.
+    """
+    package_paths = sorted(Path(directory).glob("*.zip"))
+    summary = TeamSummary()
+    counted: Dict[Tuple[str, Optional[str], str], str] = {}
+    # Reading a manifest is mostly file I/O and decompression, both of which release the GIL.
+    workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for package_path, manifest, error in executor.map(_read_or_error, package_paths):
+            if manifest is None:
+                summary.invalid_packages.append((package_path.name, error))
+                continue
+            # Results arrive in file name order, so the first copy is the one counted.
+            key = package_key(manifest)
+            if key in counted:
+                summary.invalid_packages.append((package_path.name, f"duplicate of {counted[key]}"))
+                continue
+            counted[key] = package_path.name
+
+            user_name = manifest["user_name"]
+            if user_name not in summary.contractors:
+                summary.contractors[user_name] = ContractorTotals(user_name)
+            summary.contractors[user_name].add(manifest)
+
+    return summary
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) != 3:
+        print("Usage: python -m output.consolidate <packages directory> <team report .pdf>")
+        return 2
+
+    summary = consolidate_packages(Path(argv[1]))
+    OutputGenerator().generate_team_report(summary, argv[2])
+    print(f"{summary.package_count} packages from {len(summary.contractors)} contractors, "
+          f"{summary.total_seconds / 3600.0:.4f} hours, amount {summary.amount_to_be_paid:,.2f}")
+    for name, reason in summary.invalid_packages:
+        print(f"skipped {name}: {reason}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
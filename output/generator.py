@@ -1,7 +1,8 @@
+import json
 import os
 import zipfile
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from io import BytesIO
 
 from reportlab.lib.pagesizes import LETTER
@@ -9,10 +10,40 @@ from reportlab.pdfgen import canvas
 from pypdf import PdfReader, PdfWriter
 
 from core.session import Session, SessionEndReason
+from output.manifest import MANIFEST_NAME, build_manifest
 
 # Authoritative constant from docs/04_output.md
 ADMIN_PASSWORD = "adminv1"
 
+# Output profiles trade generation time for package size. Ref: docs/04_output.md
+# - recompress_level: pypdf re-deflates content streams at this level (None keeps them as rendered).
+# - merge_identical_objects: pypdf merges duplicate objects and drops unreferenced ones.
+# - zip_compression / zip_level: how PDFs are stored inside the ZIP package.
+# Page content streams are always Flate-compressed by reportlab: uncompressed pages are
+# slower overall, because encryption then has to process larger streams.
+# Fonts are the standard Helvetica faces, which are referenced, never embedded.
+OUTPUT_PROFILES = {
+    "fast": {
+        "recompress_level": None,
+        "merge_identical_objects": False,
+        "zip_compression": zipfile.ZIP_STORED,
+        "zip_level": None,
+    },
+    "balanced": {
+        "recompress_level": None,
+        "merge_identical_objects": False,
+        "zip_compression": zipfile.ZIP_DEFLATED,
+        "zip_level": 6,
+    },
+    "smallest": {
+        "recompress_level": 9,
+        "merge_identical_objects": True,
+        "zip_compression": zipfile.ZIP_DEFLATED,
+        "zip_level": 9,
+    },
+}
+DEFAULT_OUTPUT_PROFILE = "balanced"
+
 
 class OutputGenerator:
     """
@@ -20,26 +51,40 @@ class OutputGenerator:
     Ref: docs/04_output.md
     """
 
-    def generate_package(self, sessions: List[Session], output_path: str, user_name: str = "Employee", hourly_rate: float = 0.0):
+    def __init__(self, profile: str = DEFAULT_OUTPUT_PROFILE):
+        if profile not in OUTPUT_PROFILES:
+            raise ValueError(f"Unknown output profile: {profile!r}")
+        self.profile = profile
+        self._settings = OUTPUT_PROFILES[profile]
+
+    def generate_package(self, sessions: List[Session], output_path: str, user_name: str = "Employee", hourly_rate: float = 0.0,
+                         invoice_id: Optional[str] = None):
         """
-        Creates a ZIP file containing invoice.pdf and administrative_record.pdf.
+        Creates a ZIP file containing invoice.pdf, administrative_record.pdf and manifest.json.
+        `invoice_id`, when given, is recorded in the manifest to match the package with the invoice ledger.
         """
-        invoice_data = self._render_invoice(sessions, user_name, hourly_rate)
+        invoice_data = self._optimize_pdf(self._render_invoice(sessions, user_name, hourly_rate))
         admin_record_data = self._render_administrative_record(sessions, user_name)
         
         # Encrypt the administrative record
         encrypted_admin_record = self._encrypt_pdf(admin_record_data, ADMIN_PASSWORD)
+        manifest = build_manifest(sessions, user_name, hourly_rate, datetime.now(), invoice_id=invoice_id)
 
-        with zipfile.ZipFile(output_path, 'w') as zf:
+        with zipfile.ZipFile(
+            output_path, 'w',
+            compression=self._settings["zip_compression"],
+            compresslevel=self._settings["zip_level"],
+        ) as zf:
             zf.writestr("invoice.pdf", invoice_data)
             zf.writestr("administrative_record.pdf", encrypted_admin_record)
+            zf.writestr(MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False))
 
     def _render_invoice(self, sessions: List[Session], user_name: str, hourly_rate: float) -> bytes:
         """
         Renders the invoice PDF. Does not expose inactivity details.
         """
         buffer = BytesIO()
-        c = canvas.Canvas(buffer, pagesize=LETTER)
+        c = canvas.Canvas(buffer, pagesize=LETTER, pageCompression=1)
         width, height = LETTER
 
         c.setFont("Helvetica-Bold", 16)
@@ -94,7 +139,7 @@ class OutputGenerator:
         Renders the administrative record PDF. Includes inactivity details and end reasons.
         """
         buffer = BytesIO()
-        c = canvas.Canvas(buffer, pagesize=LETTER)
+        c = canvas.Canvas(buffer, pagesize=LETTER, pageCompression=1)
         width, height = LETTER
 
         c.setFont("Helvetica-Bold", 16)
@@ -110,26 +155,34 @@ class OutputGenerator:
         c.drawString(250, y, "Dur(s)")
         c.drawString(300, y, "Inact(s)")
         c.drawString(350, y, "Reason")
-        c.drawString(450, y, "Task")
+        c.drawString(440, y, "Act/Idle(m)")
+        c.drawString(500, y, "Task")
         
         y -= 20
         c.line(50, y + 15, 550, y + 15)
         
         c.setFont("Helvetica", 9)
         total_seconds = 0
+        total_active_minutes = 0
+        total_idle_minutes = 0
         for s in sessions:
             if not s.is_complete:
                 continue
             
             duration = s.get_duration_seconds()
             total_seconds += duration
+            active_minutes = s.get_active_minutes()
+            idle_minutes = s.get_idle_minutes()
+            total_active_minutes += active_minutes
+            total_idle_minutes += idle_minutes
             
             c.drawString(50, y, s.start_time.strftime('%y-%m-%d %H:%M'))
             c.drawString(150, y, s.end_time.strftime('%y-%m-%d %H:%M'))
             c.drawString(250, y, str(duration))
             c.drawString(300, y, str(s.max_inactivity_reached_seconds))
             c.drawString(350, y, s.end_reason.name if s.end_reason else "N/A")
-            c.drawString(450, y, s.task[:15])
+            c.drawString(440, y, f"{active_minutes}/{idle_minutes}")
+            c.drawString(500, y, s.task[:10])
             y -= 15
             if y < 50:
                 c.showPage()
@@ -141,10 +194,93 @@ class OutputGenerator:
         
         total_hours = total_seconds / 3600.0
         c.drawString(50, y - 15, f"ACCUMULATED SESSION TIME (AST): {total_hours:.4f} hours")
+        c.drawString(50, y - 35, f"ACTIVE MINUTES: {total_active_minutes} | IDLE MINUTES: {total_idle_minutes}")
 
         c.save()
         return buffer.getvalue()
 
+    def generate_team_report(self, summary, output_path: str) -> None:
+        """
+        Writes the combined team summary and invoice of many packages as one PDF.
+        `summary` is a TeamSummary from output.consolidate; only manifest totals are used.
+        """
+        buffer = BytesIO()
+        c = canvas.Canvas(buffer, pagesize=LETTER, pageCompression=1)
+        width, height = LETTER
+
+        c.setFont("Helvetica-Bold", 16)
+        c.drawString(50, height - 50, "TEAM INVOICE")
+
+        c.setFont("Helvetica", 12)
+        c.drawString(50, height - 80, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        c.drawString(50, height - 100, f"Packages: {summary.package_count} | Contractors: {len(summary.contractors)}")
+
+        y = height - 140
+        c.setFont("Helvetica-Bold", 10)
+        c.drawString(50, y, "Contractor")
+        c.drawString(200, y, "Period")
+        c.drawString(350, y, "Sessions")
+        c.drawString(410, y, "Hours")
+        c.drawString(470, y, "Amount (Php)")
+
+        y -= 20
+        c.line(50, y + 15, 550, y + 15)
+
+        c.setFont("Helvetica", 9)
+        for name in sorted(summary.contractors):
+            contractor = summary.contractors[name]
+            period = ""
+            if contractor.period_start and contractor.period_end:
+                period = f"{contractor.period_start[:10]} - {contractor.period_end[:10]}"
+
+            c.drawString(50, y, name[:25])
+            c.drawString(200, y, period)
+            c.drawString(350, y, str(contractor.session_count))
+            c.drawString(410, y, f"{contractor.total_seconds / 3600.0:.4f}")
+            c.drawString(470, y, f"{contractor.amount_to_be_paid:,.2f}")
+            y -= 15
+            if y < 50:
+                c.showPage()
+                c.setFont("Helvetica", 9)
+                y = height - 50
+
+        y -= 10
+        c.line(50, y + 5, 550, y + 5)
+        c.setFont("Helvetica-Bold", 12)
+
+        total_hours = summary.total_seconds / 3600.0
+        c.drawString(50, y - 15, f"ACCUMULATED SESSION TIME (AST): {total_hours:.4f} hours")
+        c.drawString(50, y - 35, f"AMOUNT TO BE PAID: Php {summary.amount_to_be_paid:,.2f}")
+        if summary.invalid_packages:
+            c.setFont("Helvetica", 10)
+            c.drawString(50, y - 55, f"Packages skipped (invalid manifest): {len(summary.invalid_packages)}")
+
+        c.save()
+        with open(output_path, "wb") as f:
+            f.write(self._optimize_pdf(buffer.getvalue()))
+
+    def _optimize_pdf(self, pdf_data: bytes) -> bytes:
+        """
+        Rewrites the PDF through pypdf when the output profile asks for extra size optimizations.
+        """
+        if self._settings["recompress_level"] is None and not self._settings["merge_identical_objects"]:
+            return pdf_data
+
+        writer = PdfWriter(clone_from=PdfReader(BytesIO(pdf_data)))
+        self._apply_pdf_optimizations(writer)
+
+        buffer = BytesIO()
+        writer.write(buffer)
+        return buffer.getvalue()
+
+    def _apply_pdf_optimizations(self, writer: PdfWriter) -> None:
+        recompress_level = self._settings["recompress_level"]
+        if recompress_level is not None:
+            for page in writer.pages:
+                page.compress_content_streams(level=recompress_level)
+        if self._settings["merge_identical_objects"]:
+            writer.compress_identical_objects()
+
     def _encrypt_pdf(self, pdf_data: bytes, password: str) -> bytes:
         """
         Encrypts the PDF data with the given password.
@@ -154,7 +290,8 @@ class OutputGenerator:
         
         for page in reader.pages:
             writer.add_page(page)
-            
+
+        self._apply_pdf_optimizations(writer)
         writer.encrypt(password)
         
         buffer = BytesIO()
@@ -0,0 +1,109 @@
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from core.session import Session
+
+# Machine-readable summary stored in every output package. Ref: docs/04_output.md
+MANIFEST_NAME = "manifest.json"
+MANIFEST_FORMAT = "timetickit-package"
+MANIFEST_VERSION = 1
+
+
+def invoice_rows(sessions: List[Session]) -> List[List[Any]]:
+    """
+    The invoice lines as [start, end, seconds, task]. Like the invoice, excludes inactivity details.
+    """
+    return [
+        [s.start_time.isoformat(), s.end_time.isoformat(), s.get_duration_seconds(), s.task]
+        for s in sessions
+        if s.is_complete
+    ]
+
+
+def row_digest(rows: List[List[Any]]) -> str:
+    canonical = json.dumps(rows, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def build_manifest(sessions: List[Session], user_name: str, hourly_rate: float, generated_at: datetime,
+                   invoice_id: Optional[str] = None) -> Dict[str, Any]:
+    rows = invoice_rows(sessions)
+    total_seconds = sum(row[2] for row in rows)
+    return {
+        "format": MANIFEST_FORMAT,
+        "version": MANIFEST_VERSION,
+        "invoice_id": invoice_id,
+        "user_name": user_name,
+        "hourly_rate": hourly_rate,
+        "generated_at": generated_at.isoformat(),
+        "period_start": min(row[0] for row in rows) if rows else None,
+        "period_end": max(row[1] for row in rows) if rows else None,
+        "session_count": len(rows),
+        "total_seconds": total_seconds,
+        "amount_to_be_paid": round(hourly_rate * total_seconds / 3600.0, 2),
+        "row_digest": row_digest(rows),
+        "rows": rows,
+    }
+
+
+def _is_number(value: Any, integer: bool = False) -> bool:
+    # bool is a subclass of int, but true/false is not a count or an amount.
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) if integer else isinstance(value, (int, float))
+
+
+def _is_valid_row(row: Any) -> bool:
+    return (
+        isinstance(row, list)
+        and len(row) == 4
+        and isinstance(row[0], str)
+        and isinstance(row[1], str)
+        and _is_number(row[2], integer=True)
+        and isinstance(row[3], str)
+    )
+
+
+def verify_manifest(manifest: Any) -> None:
+    """
+    Checks the field types, that the rows match their digest, and that the totals
+    and period are derived from the rows. Raises ValueError describing the first mismatch.
+    """
+    if not isinstance(manifest, dict):
+        raise ValueError("manifest is not a JSON object")
+    if manifest.get("format") != MANIFEST_FORMAT or manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError("not a TimeTickIt package manifest")
+
+    # Types are checked before anything is compared or summed, so one malformed
+    # package is reported instead of failing the whole consolidation.
+    rows = manifest["rows"]
+    if not isinstance(rows, list) or not all(_is_valid_row(row) for row in rows):
+        raise ValueError("manifest rows must be a list of [start, end, seconds, task]")
+    if not isinstance(manifest["user_name"], str):
+        raise ValueError("user_name must be a string")
+    if manifest.get("invoice_id") is not None and not isinstance(manifest["invoice_id"], str):
+        raise ValueError("invoice_id must be a string or null")
+    for field in ("session_count", "total_seconds"):
+        if not _is_number(manifest[field], integer=True):
+            raise ValueError(f"{field} must be an integer")
+    for field in ("hourly_rate", "amount_to_be_paid"):
+        if not _is_number(manifest[field]):
+            raise ValueError(f"{field} must be a number")
+
+    if row_digest(rows) != manifest["row_digest"]:
+        raise ValueError("row digest does not match")
+    if len(rows) != manifest["session_count"]:
+        raise ValueError("session count does not match rows")
+
+    total_seconds = sum(row[2] for row in rows)
+    if total_seconds != manifest["total_seconds"]:
+        raise ValueError("total seconds do not match rows")
+    if round(manifest["hourly_rate"] * total_seconds / 3600.0, 2) != manifest["amount_to_be_paid"]:
+        raise ValueError("amount does not match total time and rate")
+    if manifest["period_start"] != (min(row[0] for row in rows) if rows else None):
+        raise ValueError("period_start does not match rows")
+    if manifest["period_end"] != (max(row[1] for row in rows) if rows else None):
+        raise ValueError("period_end does not match rows")
+
@@ -0,0 +1,207 @@
+"""
+Live status block shared with external readers (status bars, shell prompts, monitoring agents).
+
+The app writes a small fixed-size record into a memory-mapped file once per tick.
+Readers map the same file and poll it without any IPC with the app. A sequence
+counter (seqlock) lets readers detect and retry a read that overlapped a write.
+
+This module deliberately does not import the rest of TimeTickIt, so readers can
+copy or import it on its own.
+"""
+import mmap
+import struct
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+STATUS_MAGIC = b"TTST"
+STATUS_VERSION = 1
+TASK_FIELD_BYTES = 128  # Longer tasks (UTF-8 encoded) are truncated in the block
+
+# magic, version, sequence counter. The counter is odd while a write is in progress.
+HEADER = struct.Struct("<4sHxxI")
+SEQUENCE_OFFSET = struct.calcsize("<4sHxx")
+SEQUENCE_FIELD = struct.Struct("<I")
+
+# state, task length, session start, inactivity, inactivity limit, today's total, updated at, task.
+PAYLOAD = struct.Struct(f"<BxH q I I I q {TASK_FIELD_BYTES}s")
+BLOCK_SIZE = HEADER.size + PAYLOAD.size
+
+# Tracker states as published in the block.
+STATE_NOT_RUNNING = 0
+STATE_IDLE = 1
+STATE_ACTIVE = 2
+STATE_NAMES = {STATE_NOT_RUNNING: "NOT_RUNNING", STATE_IDLE: "IDLE", STATE_ACTIVE: "ACTIVE"}
+
+READ_ATTEMPTS = 100  # A reader gives up after this many reads that overlapped a write
+# The app publishes every second; an older block means the app is not running (e.g. it crashed).
+STALE_AFTER_SECONDS = 10
+
+# Times are stored as naive microseconds since this epoch so they round-trip exactly.
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_micros(value: Optional[datetime]) -> int:
+    if value is None:
+        return 0
+    return (value - _EPOCH) // _ONE_MICROSECOND
+
+
+def _from_micros(value: int) -> Optional[datetime]:
+    if value == 0:
+        return None
+    return _EPOCH + timedelta(microseconds=value)
+
+
+class LiveStatus:
+    """
+    One consistent snapshot of the tracker status.
+    """
+
+    def __init__(self, state: int, task: str, session_start: Optional[datetime], inactivity_seconds: int,
+                 max_inactivity_seconds: int, today_total_seconds: int, updated_at: Optional[datetime]):
+        self.state: int = state
+        self.task: str = task
+        self.session_start: Optional[datetime] = session_start
+        self.inactivity_seconds: int = inactivity_seconds
+        self.max_inactivity_seconds: int = max_inactivity_seconds
+        self.today_total_seconds: int = today_total_seconds
+        self.updated_at: Optional[datetime] = updated_at
+
+    @property
+    def state_name(self) -> str:
+        return STATE_NAMES.get(self.state, "UNKNOWN")
+
+    @property
+    def seconds_until_auto_end(self) -> Optional[int]:
+        """
+        Seconds left before the session ends due to inactivity, or None when not ACTIVE.
+        """
+        if self.state != STATE_ACTIVE:
+            return None
+        return max(self.max_inactivity_seconds - self.inactivity_seconds, 0)
+
+    def is_stale(self, now: Optional[datetime] = None, max_age_seconds: float = STALE_AFTER_SECONDS) -> bool:
+        """
+        True if the block was not updated recently. A crashed app leaves its last state
+        (possibly ACTIVE) in the block, so readers should check this before trusting it.
+        """
+        if self.updated_at is None:
+            return True
+        return ((now or datetime.now()) - self.updated_at).total_seconds() > max_age_seconds
+
+
+class StatusBlockWriter:
+    """
+    Publishes the tracker status into the shared block. Used by the app only.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # An existing block is reused in place: truncating a file that readers
+        # have mapped would make their next access fail.
+        if not self.path.exists() or self.path.stat().st_size != BLOCK_SIZE:
+            with open(self.path, "wb") as f:
+                f.write(bytes(BLOCK_SIZE))
+        self._file = open(self.path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), BLOCK_SIZE)
+
+        # Continue the previous run's sequence so readers never see it go backwards.
+        self._sequence = SEQUENCE_FIELD.unpack_from(self._map, SEQUENCE_OFFSET)[0] & ~1
+        SEQUENCE_FIELD.pack_into(self._map, SEQUENCE_OFFSET, self._sequence)
+        self._map[:SEQUENCE_OFFSET] = HEADER.pack(STATUS_MAGIC, STATUS_VERSION, 0)[:SEQUENCE_OFFSET]
+
+    def publish(self, state: int, task: str = "", session_start: Optional[datetime] = None,
+                inactivity_seconds: int = 0, max_inactivity_seconds: int = 0,
+                today_total_seconds: int = 0, updated_at: Optional[datetime] = None) -> None:
+        task_bytes = task.encode("utf-8")[:TASK_FIELD_BYTES]
+        payload = PAYLOAD.pack(
+            state,
+            len(task_bytes),
+            _to_micros(session_start),
+            inactivity_seconds,
+            max_inactivity_seconds,
+            today_total_seconds,
+            _to_micros(updated_at or datetime.now()),
+            task_bytes,
+        )
+
+        # Odd sequence marks the write in progress; readers retry until it is even again.
+        self._sequence = (self._sequence + 1) & 0xFFFFFFFF
+        SEQUENCE_FIELD.pack_into(self._map, SEQUENCE_OFFSET, self._sequence)
+        self._map[HEADER.size:BLOCK_SIZE] = payload
+        self._sequence = (self._sequence + 1) & 0xFFFFFFFF
+        SEQUENCE_FIELD.pack_into(self._map, SEQUENCE_OFFSET, self._sequence)
+
+    def close(self) -> None:
+        """
+        Publishes NOT_RUNNING so readers can tell the app has exited, then releases the block.
+        """
+        self.publish(STATE_NOT_RUNNING)
+        self._map.close()
+        self._file.close()
+
+
+class StatusBlockReader:
+    """
+    Reads snapshots of the tracker status. Cheap enough to poll thousands of times per second.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+
+    def _open(self) -> Optional[mmap.mmap]:
+        if self._map is not None:
+            return self._map
+        if not self.path.exists() or self.path.stat().st_size != BLOCK_SIZE:
+            return None
+
+        self._file = open(self.path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), BLOCK_SIZE, access=mmap.ACCESS_READ)
+        return self._map
+
+    def read(self) -> Optional[LiveStatus]:
+        """
+        Returns the current status, or None if no block has been published
+        or it has an unknown layout version.
+        """
+        block = self._open()
+        if block is None:
+            return None
+
+        for _ in range(READ_ATTEMPTS):
+            magic, version, sequence_before = HEADER.unpack_from(block, 0)
+            if magic != STATUS_MAGIC or version != STATUS_VERSION:
+                return None
+            if sequence_before & 1:
+                continue
+
+            payload = block[HEADER.size:BLOCK_SIZE]
+            if SEQUENCE_FIELD.unpack_from(block, SEQUENCE_OFFSET)[0] != sequence_before:
+                continue
+
+            state, task_length, start_us, inactivity, max_inactivity, today_total, updated_us, task_bytes = (
+                PAYLOAD.unpack(payload)
+            )
+            return LiveStatus(
+                state=state,
+                task=task_bytes[:task_length].decode("utf-8", errors="ignore"),
+                session_start=_from_micros(start_us),
+                inactivity_seconds=inactivity,
+                max_inactivity_seconds=max_inactivity,
+                today_total_seconds=today_total,
+                updated_at=_from_micros(updated_us),
+            )
+        return None
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,121 @@
+import mmap
+import struct
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional, Tuple
+
+from core.session import Session
+
+# Fixed-size on-disk layout of the active session checkpoint.
+# magic, version, is_active flag, start time, last activity time, task length, task bytes.
+CHECKPOINT_MAGIC = b"TTCK"
+CHECKPOINT_VERSION = 1
+TASK_FIELD_BYTES = 256  # Tasks longer than this (UTF-8 encoded) are truncated in the checkpoint
+RECORD = struct.Struct(f"<4sHHqqH{TASK_FIELD_BYTES}s")
+
+# The last activity time is the only field rewritten on every tick.
+LAST_ACTIVITY_OFFSET = struct.calcsize("<4sHHq")
+LAST_ACTIVITY_FIELD = struct.Struct("<q")
+
+# Times are stored as naive microseconds since this epoch so they round-trip exactly.
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_micros(value: datetime) -> int:
+    return (value - _EPOCH) // _ONE_MICROSECOND
+
+
+def _from_micros(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
+
+
+class SessionCheckpoint:
+    """
+    Crash-safe checkpoint of the active session, kept in a small fixed-size file.
+
+    The full record is written once when a session starts. Afterwards only the
+    8-byte last activity time is updated in place through a memory map, so it can
+    be refreshed on every tick without rewriting config.json.
+    Ref: docs/03_system_core.md (Application Interruption Handling)
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+
+    def _open(self) -> mmap.mmap:
+        if self._map is not None:
+            return self._map
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.path.exists() or self.path.stat().st_size != RECORD.size:
+            with open(self.path, "wb") as f:
+                f.write(bytes(RECORD.size))
+
+        self._file = open(self.path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), RECORD.size)
+        return self._map
+
+    def write_session(self, session: Session, last_activity_time: Optional[datetime] = None) -> None:
+        """
+        Writes the full record for a newly started session.
+        """
+        task_bytes = session.task.encode("utf-8")[:TASK_FIELD_BYTES]
+        activity_time = last_activity_time or session.start_time
+        record = RECORD.pack(
+            CHECKPOINT_MAGIC,
+            CHECKPOINT_VERSION,
+            1,
+            _to_micros(session.start_time),
+            _to_micros(activity_time),
+            len(task_bytes),
+            task_bytes,
+        )
+        checkpoint = self._open()
+        checkpoint[:] = record
+        checkpoint.flush()
+
+    def touch(self, last_activity_time: datetime) -> None:
+        """
+        Updates only the last activity time of the checkpointed session.
+        """
+        checkpoint = self._open()
+        LAST_ACTIVITY_FIELD.pack_into(checkpoint, LAST_ACTIVITY_OFFSET, _to_micros(last_activity_time))
+        checkpoint.flush()
+
+    def clear(self) -> None:
+        """
+        Marks the checkpoint as holding no active session.
+        """
+        checkpoint = self._open()
+        checkpoint[:] = bytes(RECORD.size)
+        checkpoint.flush()
+
+    def read(self) -> Optional[Tuple[datetime, str, datetime]]:
+        """
+        Returns (start_time, task, last_activity_time) of a checkpointed session,
+        or None if no session was active.
+        """
+        if not self.path.exists() or self.path.stat().st_size != RECORD.size:
+            return None
+
+        with open(self.path, "rb") as f:
+            data = f.read(RECORD.size)
+
+        magic, version, is_active, start_us, activity_us, task_length, task_bytes = RECORD.unpack(data)
+        if magic != CHECKPOINT_MAGIC or version != CHECKPOINT_VERSION or not is_active:
+            return None
+
+        # errors="ignore" drops a multi-byte character cut by truncation.
+        task = task_bytes[:task_length].decode("utf-8", errors="ignore")
+        return _from_micros(start_us), task, _from_micros(activity_us)
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,126 @@
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from core.session import Session, SessionEndReason
+
+# (start_time, end_time, task, end_reason, max_inactivity_reached_seconds)
+HistoryRow = Tuple[str, str, str, int, int]
+
+
+def session_to_row(session: Session) -> HistoryRow:
+    return (
+        session.start_time.isoformat(),
+        session.end_time.isoformat(),
+        session.task,
+        session.end_reason.value,
+        session.max_inactivity_reached_seconds,
+    )
+
+
+class SessionHistory:
+    """
+    Store for historical sessions brought in from other timesheets.
+
+    Kept outside config.json so that large histories do not slow down the app's
+    load and save. A session is identified by its start time, end time and task;
+    adding the same session twice keeps one copy. Imported sessions are never
+    invoiced again; they are shown in See Record and listed by the CLI below.
+    Ref: README.md (Importing Past Timesheets)
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.path))
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " start_time TEXT NOT NULL,"
+            " end_time TEXT NOT NULL,"
+            " task TEXT NOT NULL,"
+            " end_reason INTEGER NOT NULL,"
+            " max_inactivity_reached_seconds INTEGER NOT NULL,"
+            " PRIMARY KEY (start_time, end_time, task)"
+            ") WITHOUT ROWID"
+        )
+        self._connection.commit()
+
+    def add_batch(self, rows: List[HistoryRow]) -> int:
+        """
+        Adds rows in one transaction and returns how many were new.
+        """
+        changes_before = self._connection.total_changes
+        self._connection.executemany("INSERT OR IGNORE INTO sessions VALUES (?, ?, ?, ?, ?)", rows)
+        self._connection.commit()
+        return self._connection.total_changes - changes_before
+
+    def count(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def summary(self) -> Tuple[int, int]:
+        """
+        Returns (session count, total SESSION TIME in seconds), computed inside SQLite.
+        """
+        # Rounded to milliseconds before truncating, so float error cannot drop a second.
+        count, total_seconds = self._connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(CAST(ROUND((julianday(end_time) - julianday(start_time)) * 86400, 3)"
+            " AS INTEGER)), 0) FROM sessions"
+        ).fetchone()
+        return count, total_seconds
+
+    def iter_sessions(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Iterator[Session]:
+        """
+        Yields stored sessions in start time order, without loading them all at once.
+        `start` and `end` limit the result to sessions starting within [start, end).
+        """
+        # ISO 8601 text sorts chronologically, so the range uses the primary key index.
+        conditions, parameters = [], []
+        if start:
+            conditions.append("start_time >= ?")
+            parameters.append(start.isoformat())
+        if end:
+            conditions.append("start_time < ?")
+            parameters.append(end.isoformat())
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        cursor = self._connection.execute(f"SELECT * FROM sessions{where} ORDER BY start_time", parameters)
+        for start_time, end_time, task, end_reason, max_inactivity in cursor:
+            session = Session(start_time=datetime.fromisoformat(start_time), task=task)
+            session.end(datetime.fromisoformat(end_time), SessionEndReason(end_reason), max_inactivity)
+            yield session
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+def main(argv: List[str]) -> int:
+    usage = (
+        "Usage: python -m storage.history <history.sqlite3> list\n"
+        "       python -m storage.history <history.sqlite3> period <start> <end>"
+    )
+    if len(argv) < 3 or not Path(argv[1]).exists():
+        print(usage)
+        return 2
+
+    history = SessionHistory(Path(argv[1]))
+    command = argv[2]
+    try:
+        if command == "list" and len(argv) == 3:
+            sessions = history.iter_sessions()
+        elif command == "period" and len(argv) == 5:
+            sessions = history.iter_sessions(datetime.fromisoformat(argv[3]), datetime.fromisoformat(argv[4]))
+        else:
+            print(usage)
+            return 2
+
+        for session in sessions:
+            print(f"{session.start_time.isoformat()}\t{session.end_time.isoformat()}\t"
+                  f"{session.get_duration_seconds()}\t{session.end_reason.name}\t{session.task}")
+    finally:
+        history.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,205 @@
+import csv
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.session import Session, SessionEndReason
+from storage.history import HistoryRow, SessionHistory, session_to_row
+from storage.ledger import InvoiceLedger
+
+IMPORT_BATCH_SIZE = 5000  # Rows written to the history store per transaction
+MAX_REPORTED_REJECTS = 100  # Rejects kept in memory for the report; all of them go to the rejects file
+CSV_EXTENSIONS = (".csv",)
+JSON_LINES_EXTENSIONS = (".jsonl", ".ndjson")
+
+
+class ImportReport:
+    """
+    Outcome of one import. `rejects` holds (line number, reason) for the first rejected rows.
+    """
+
+    def __init__(self):
+        self.rows_read: int = 0
+        self.imported: int = 0
+        self.duplicates: int = 0
+        self.rejected: int = 0
+        self.rejects: List[Tuple[int, str]] = []
+
+
+def _parse_end_reason(value: Any) -> SessionEndReason:
+    # Historical timesheets usually carry no end reason; they were ended by the user.
+    if value is None or value == "":
+        return SessionEndReason.USER_STOPPED
+    # bool is a subclass of int, but true/false is not a valid reason.
+    if isinstance(value, int) and not isinstance(value, bool):
+        return SessionEndReason(value)
+    if not isinstance(value, str):
+        raise ValueError(value)
+    if value.isdigit():
+        return SessionEndReason(int(value))
+    return SessionEndReason[value.strip().upper()]
+
+
+def parse_session(record: Dict[str, Any]) -> Session:
+    """
+    Builds a completed Session from one imported record.
+    Raises ValueError describing the first rule the record breaks.
+    """
+    try:
+        start_value, end_value = record["start_time"], record["end_time"]
+    except KeyError as e:
+        raise ValueError(f"missing {e.args[0]}")
+    # JSON numbers such as 20250101 would otherwise parse as dates.
+    if not isinstance(start_value, str) or not isinstance(end_value, str):
+        raise ValueError("start_time and end_time must be ISO 8601 strings")
+    try:
+        start_time = datetime.fromisoformat(start_value.strip())
+        end_time = datetime.fromisoformat(end_value.strip())
+    except ValueError:
+        raise ValueError("start_time and end_time must be ISO 8601 timestamps")
+
+    # Sessions hold naive local times, as the app records them; an offset-aware
+    # time cannot be compared with them.
+    if start_time.tzinfo is not None or end_time.tzinfo is not None:
+        raise ValueError("start_time and end_time must be local times without a UTC offset")
+
+    if end_time <= start_time:
+        raise ValueError("end_time must be after start_time")
+
+    try:
+        end_reason = _parse_end_reason(record.get("end_reason"))
+    except (KeyError, ValueError):
+        raise ValueError(f"invalid end_reason {record.get('end_reason')!r}")
+
+    try:
+        inactivity_value = record.get("max_inactivity_reached_seconds") or 0
+        if isinstance(inactivity_value, (bool, float)):
+            raise TypeError(inactivity_value)
+        inactivity_seconds = int(inactivity_value)
+    except (TypeError, ValueError):
+        raise ValueError("max_inactivity_reached_seconds must be an integer")
+    if inactivity_seconds < 0:
+        raise ValueError("max_inactivity_reached_seconds must not be negative")
+
+    task = record.get("task")
+    if task is None:
+        task = ""
+    elif not isinstance(task, str):
+        raise ValueError("task must be a string")
+
+    session = Session(start_time=start_time, task=task)
+    session.end(end_time, end_reason, inactivity_seconds=inactivity_seconds)
+    return session
+
+
+def _read_records(path: Path) -> Iterator[Tuple[int, Optional[Dict[str, Any]], str]]:
+    """
+    Yields (line number, record, error) one row at a time. Either record or error is set.
+    """
+    suffix = path.suffix.lower()
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if suffix in CSV_EXTENSIONS:
+            reader = csv.DictReader(f)
+            while True:
+                try:
+                    record = next(reader)
+                except StopIteration:
+                    break
+                except csv.Error as e:
+                    # The reader skips the malformed line (e.g. a field over the size
+                    # limit) and continues with the next one; line_num was not advanced.
+                    yield reader.line_num + 1, None, f"unreadable CSV row: {e}"
+                    continue
+                yield reader.line_num, record, ""
+        elif suffix in JSON_LINES_EXTENSIONS:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    yield line_number, None, "invalid JSON"
+                    continue
+                if not isinstance(record, dict):
+                    yield line_number, None, "expected a JSON object"
+                    continue
+                yield line_number, record, ""
+        else:
+            raise ValueError(f"Unsupported import file type: {path.suffix!r} (expected .csv or .jsonl)")
+
+
+def import_sessions(
+    path: Path,
+    history: SessionHistory,
+    existing_sessions: Iterable[Session] = (),
+    rejects_path: Optional[Path] = None,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    ledger: Optional[InvoiceLedger] = None,
+) -> ImportReport:
+    """
+    Streams a CSV or JSON Lines timesheet into the history store.
+
+    Rows are validated against Session rules, deduplicated against the history store,
+    `existing_sessions` (the sessions not yet invoiced) and the invoice `ledger`, and
+    written in batches. Memory use does not depend on the file size.
+    """
+    path = Path(path)
+    report = ImportReport()
+    existing_keys = {session_to_row(s)[:3] for s in existing_sessions if s.is_complete}
+    batch: List[HistoryRow] = []
+    rejects_file = open(rejects_path, "w", encoding="utf-8", newline="") if rejects_path else None
+    rejects_writer = csv.writer(rejects_file) if rejects_file else None
+
+    def reject(line_number: int, reason: str) -> None:
+        report.rejected += 1
+        if len(report.rejects) < MAX_REPORTED_REJECTS:
+            report.rejects.append((line_number, reason))
+        if rejects_writer:
+            rejects_writer.writerow([line_number, reason])
+
+    def flush() -> None:
+        rows = batch
+        if ledger is not None:
+            # One period lookup per batch; the ledger only reads segments overlapping it.
+            first_start = datetime.fromisoformat(min(row[0] for row in batch))
+            last_start = datetime.fromisoformat(max(row[0] for row in batch))
+            invoiced_keys = {
+                session_to_row(s)[:3] for _, s in ledger.query_period(first_start, last_start + timedelta(microseconds=1))
+            }
+            rows = [row for row in batch if row[:3] not in invoiced_keys]
+        inserted = history.add_batch(rows)
+        report.imported += inserted
+        report.duplicates += len(batch) - inserted
+        batch.clear()
+
+    try:
+        if rejects_writer:
+            rejects_writer.writerow(["line", "reason"])
+
+        for line_number, record, error in _read_records(path):
+            report.rows_read += 1
+            if error:
+                reject(line_number, error)
+                continue
+            try:
+                row = session_to_row(parse_session(record))
+            except ValueError as e:
+                reject(line_number, str(e))
+                continue
+
+            if row[:3] in existing_keys:
+                report.duplicates += 1
+                continue
+
+            batch.append(row)
+            if len(batch) >= batch_size:
+                flush()
+
+        if batch:
+            flush()
+    finally:
+        if rejects_file:
+            rejects_file.close()
+
+    return report
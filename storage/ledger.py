@@ -0,0 +1,238 @@
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from core.session import Session
+
+LEDGER_INDEX_NAME = "index.json"
+LEDGER_INDEX_VERSION = 1
+SEGMENTS_DIR_NAME = "segments"
+
+
+def _write_atomically(path: Path, lines: Iterator[str]) -> None:
+    """
+    Writes a file so that readers see either the old version or the complete new one.
+    """
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        for line in lines:
+            f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+class InvoiceLedger:
+    """
+    Append-only archive of invoiced sessions, kept out of config.json.
+
+    Each export seals its sessions into a new immutable segment file tagged with the
+    invoice id. Compaction merges the segments of a closed month into one segment.
+    A small index maps every invoice to its segment and period, so lookups only
+    read the segments they need.
+    Ref: docs/04_output.md (Invoiced History)
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.segments_dir = self.directory / SEGMENTS_DIR_NAME
+        self.index_path = self.directory / LEDGER_INDEX_NAME
+        self._index: Optional[Dict[str, Any]] = None
+
+    def _load_index(self) -> Dict[str, Any]:
+        # Loaded on first use, so opening the app never reads the ledger.
+        if self._index is None:
+            if self.index_path.exists():
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+            else:
+                self._index = {"version": LEDGER_INDEX_VERSION, "invoices": {}, "segments": {}, "compactions": 0}
+        return self._index
+
+    def _save_index(self) -> None:
+        _write_atomically(self.index_path, [json.dumps(self._load_index(), indent=1)])
+
+    def next_invoice_id(self, export_time: datetime) -> str:
+        """
+        Returns an unused invoice id for an export at `export_time` (INV-YYYYMMDD-HHMMSS).
+        A later export in the same second gets a numbered suffix, e.g. INV-20260101-093000-2.
+        """
+        invoices = self._load_index()["invoices"]
+        base_id = f"INV-{export_time.strftime('%Y%m%d-%H%M%S')}"
+        invoice_id, number = base_id, 1
+        while invoice_id in invoices:
+            number += 1
+            invoice_id = f"{base_id}-{number}"
+        return invoice_id
+
+    def is_sealed(self, invoice_id: str) -> bool:
+        return invoice_id in self._load_index()["invoices"]
+
+    def seal(self, invoice_id: str, sessions: List[Session], sealed_at: Optional[datetime] = None) -> None:
+        """
+        Archives the completed sessions of one export under `invoice_id`.
+        Raises ValueError if the invoice id was already sealed, since segments are immutable.
+        """
+        index = self._load_index()
+        if invoice_id in index["invoices"]:
+            raise ValueError(f"Invoice {invoice_id!r} is already sealed in the ledger")
+
+        completed = [s for s in sessions if s.is_complete]
+        segment_name = f"invoice-{invoice_id}.jsonl"
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        _write_atomically(
+            self.segments_dir / segment_name,
+            (json.dumps({"invoice_id": invoice_id, "session": s.to_dict()}) + "\n" for s in completed),
+        )
+
+        index["invoices"][invoice_id] = {
+            "segment": segment_name,
+            "sealed_at": (sealed_at or datetime.now()).isoformat(),
+            "period_start": min(s.start_time for s in completed).isoformat() if completed else None,
+            "period_end": max(s.end_time for s in completed).isoformat() if completed else None,
+            "session_count": len(completed),
+            "total_seconds": sum(s.get_duration_seconds() for s in completed),
+        }
+        index["segments"][segment_name] = {"invoice_ids": [invoice_id]}
+        try:
+            self._save_index()
+        except BaseException:
+            # Keep memory in step with the file on disk, so the seal can be retried.
+            del index["invoices"][invoice_id]
+            del index["segments"][segment_name]
+            raise
+
+    def seal_pending(self, invoice_id: str, sessions: List[Session], sealed_at: Optional[datetime] = None) -> bool:
+        """
+        Finishes an export that was interrupted before its sessions were sealed: seals them
+        under `invoice_id` unless that invoice is already in the index. A segment file left
+        without an index entry (a crash before the index was saved) is replaced.
+        Returns True if the sessions were sealed by this call.
+        """
+        if self.is_sealed(invoice_id):
+            return False
+        self.seal(invoice_id, sessions, sealed_at=sealed_at)
+        return True
+
+    def list_invoices(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Index entries of all sealed invoices, by invoice id.
+        """
+        return dict(self._load_index()["invoices"])
+
+    def _read_segment_lines(self, segment_name: str) -> Iterator[str]:
+        with open(self.segments_dir / segment_name, "r", encoding="utf-8") as f:
+            yield from f
+
+    def _read_segment(self, segment_name: str) -> Iterator[Tuple[str, Session]]:
+        for line in self._read_segment_lines(segment_name):
+            record = json.loads(line)
+            yield record["invoice_id"], Session.from_dict(record["session"])
+
+    def get_invoice(self, invoice_id: str) -> List[Session]:
+        """
+        Sessions sealed under one invoice. Raises KeyError for an unknown invoice id.
+        """
+        entry = self._load_index()["invoices"][invoice_id]
+        return [s for sealed_id, s in self._read_segment(entry["segment"]) if sealed_id == invoice_id]
+
+    def query_period(self, start: datetime, end: datetime) -> Iterator[Tuple[str, Session]]:
+        """
+        Yields (invoice id, session) for sealed sessions starting within [start, end).
+        Only segments whose indexed period overlaps the range are read.
+        """
+        start_text, end_text = start.isoformat(), end.isoformat()
+        wanted: Dict[str, set] = {}
+        for invoice_id, entry in self._load_index()["invoices"].items():
+            if entry["period_start"] is None:
+                continue
+            if entry["period_start"] < end_text and entry["period_end"] >= start_text:
+                wanted.setdefault(entry["segment"], set()).add(invoice_id)
+
+        for segment_name in sorted(wanted):
+            for invoice_id, session in self._read_segment(segment_name):
+                if invoice_id in wanted[segment_name] and start <= session.start_time < end:
+                    yield invoice_id, session
+
+    def compact(self, before: Optional[datetime] = None) -> int:
+        """
+        Merges the segments of each closed month (before the month of `before`,
+        default now) into one segment per month. Returns the number of segments removed.
+        The index is switched to the merged segment before the old files are deleted,
+        so an interrupted compaction leaves only unreferenced files behind.
+        """
+        index = self._load_index()
+        current_month = (before or datetime.now()).strftime("%Y-%m")
+
+        by_month: Dict[str, List[str]] = {}
+        for segment_name, segment in index["segments"].items():
+            periods = [index["invoices"][i]["period_start"] for i in segment["invoice_ids"]]
+            months = {p[:7] for p in periods if p}
+            if len(months) == 1 and min(months) < current_month:
+                by_month.setdefault(min(months), []).append(segment_name)
+
+        removed = 0
+        for month, segment_names in sorted(by_month.items()):
+            if len(segment_names) < 2:
+                continue
+
+            segment_names.sort()
+            invoice_ids = [i for name in segment_names for i in index["segments"][name]["invoice_ids"]]
+            # A month can be compacted again if late invoices arrive, so merged names carry a counter.
+            index["compactions"] = index.get("compactions", 0) + 1
+            merged_name = f"period-{month}-{index['compactions']:04d}.jsonl"
+            _write_atomically(
+                self.segments_dir / merged_name,
+                (line for name in segment_names for line in self._read_segment_lines(name)),
+            )
+
+            for invoice_id in invoice_ids:
+                index["invoices"][invoice_id]["segment"] = merged_name
+            for name in segment_names:
+                del index["segments"][name]
+            index["segments"][merged_name] = {"invoice_ids": invoice_ids}
+            self._save_index()
+
+            for name in segment_names:
+                (self.segments_dir / name).unlink(missing_ok=True)
+            removed += len(segment_names)
+
+        return removed
+
+
+def main(argv: List[str]) -> int:
+    usage = (
+        "Usage: python -m storage.ledger <ledger directory> list\n"
+        "       python -m storage.ledger <ledger directory> invoice <invoice id>\n"
+        "       python -m storage.ledger <ledger directory> period <start> <end>"
+    )
+    if len(argv) < 3:
+        print(usage)
+        return 2
+
+    ledger = InvoiceLedger(Path(argv[1]))
+    command = argv[2]
+    if command == "list" and len(argv) == 3:
+        for invoice_id, entry in sorted(ledger.list_invoices().items()):
+            print(f"{invoice_id}\t{entry['period_start']}\t{entry['period_end']}\t"
+                  f"{entry['session_count']} sessions\t{entry['total_seconds'] / 3600.0:.4f} h")
+    elif command == "invoice" and len(argv) == 4:
+        for session in ledger.get_invoice(argv[3]):
+            print(f"{session.start_time.isoformat()}\t{session.end_time.isoformat()}\t"
+                  f"{session.get_duration_seconds()}\t{session.end_reason.name}\t{session.task}")
+    elif command == "period" and len(argv) == 5:
+        start, end = datetime.fromisoformat(argv[3]), datetime.fromisoformat(argv[4])
+        for invoice_id, session in ledger.query_period(start, end):
+            print(f"{invoice_id}\t{session.start_time.isoformat()}\t{session.end_time.isoformat()}\t"
+                  f"{session.get_duration_seconds()}\t{session.task}")
+    else:
+        print(usage)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
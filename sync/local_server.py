@@ -0,0 +1,88 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Set
+
+from sync.transport import decode_batch
+
+
+class LocalSyncServer:
+    """
+    In-process stand-in for the central timesheet store, used by tests and benchmarks.
+
+    Accepts batches from HttpTransport, keeps one record per idempotency key,
+    and can be told to fail the next N requests to exercise retries, or to reject
+    (400) any batch containing a given task to exercise parking.
+    """
+
+    def __init__(self):
+        self.records: Dict[str, dict] = {}
+        self.requests_received: int = 0
+        self.duplicates_received: int = 0
+        self._failures_remaining: int = 0
+        self._rejected_tasks: Set[str] = set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/sessions"
+
+    def fail_next_requests(self, count: int) -> None:
+        with self._lock:
+            self._failures_remaining = count
+
+    def reject_task(self, task: str) -> None:
+        with self._lock:
+            self._rejected_tasks.add(task)
+
+    def start(self) -> "LocalSyncServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _accept(self, body: bytes) -> int:
+        with self._lock:
+            self.requests_received += 1
+            if self._failures_remaining > 0:
+                self._failures_remaining -= 1
+                return 503
+
+            records = decode_batch(body)
+            if any(record["task"] in self._rejected_tasks for record in records):
+                return 400
+
+            for record in records:
+                key = record["idempotency_key"]
+                if key in self.records:
+                    self.duplicates_received += 1
+                self.records[key] = record
+            return 200
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 keeps the connection open between batches.
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without this, delayed ACKs stall every batch.
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                status = server._accept(self.rfile.read(length))
+                body = b"{}"
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable, List, Tuple
+
+from core.events import EngineEvent, EngineEventType
+from core.session import Session
+
+# Number of rows enqueued per SQLite transaction by enqueue_many.
+ENQUEUE_CHUNK_SIZE = 10000
+
+
+def idempotency_key(session: Session, user_name: str) -> str:
+    """
+    Stable key for a completed session, so the central store can drop re-sent copies.
+    """
+    parts = [
+        user_name,
+        session.start_time.isoformat(),
+        session.end_time.isoformat() if session.end_time else "",
+        session.task,
+        str(session.end_reason.value) if session.end_reason else "",
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()[:32]
+
+
+class SyncOutbox:
+    """
+    Durable local queue of completed sessions waiting to be uploaded.
+
+    Rows stay in the outbox until the endpoint acknowledges them, so an upload
+    interrupted by a crash or restart resumes from where it stopped.
+    Ref: docs/04_output.md (Central Sync)
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # The outbox is filled from the UI thread and drained from a sync thread.
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            " id INTEGER PRIMARY KEY,"
+            " idempotency_key TEXT NOT NULL,"
+            " payload TEXT NOT NULL)"
+        )
+        # Records the endpoint permanently rejected. They are kept for inspection but
+        # no longer block the records queued behind them.
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS parked ("
+            " id INTEGER PRIMARY KEY,"
+            " idempotency_key TEXT NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " reason TEXT NOT NULL)"
+        )
+        self._connection.commit()
+
+    def enqueue(self, session: Session, user_name: str) -> None:
+        self.enqueue_many([session], user_name)
+
+    def enqueue_many(self, sessions: Iterable[Session], user_name: str) -> None:
+        """
+        Adds completed sessions to the outbox. Re-queued sessions keep their
+        idempotency key, so the endpoint stores them only once.
+        """
+        chunk: List[Tuple[str, str]] = []
+        for session in sessions:
+            if not session.is_complete:
+                continue
+            key = idempotency_key(session, user_name)
+            record = session.to_dict()
+            record["user_name"] = user_name
+            record["idempotency_key"] = key
+            chunk.append((key, json.dumps(record)))
+            if len(chunk) >= ENQUEUE_CHUNK_SIZE:
+                self._insert(chunk)
+                chunk = []
+        if chunk:
+            self._insert(chunk)
+
+    def _insert(self, rows: List[Tuple[str, str]]) -> None:
+        with self._lock:
+            self._connection.executemany(
+                "INSERT INTO outbox (idempotency_key, payload) VALUES (?, ?)", rows
+            )
+            self._connection.commit()
+
+    def record_ended_sessions(self, events: List[EngineEvent], user_name: str) -> None:
+        """
+        Enqueues every session ended in a batch of engine events.
+        """
+        ended = [e.session for e in events if e.type == EngineEventType.SESSION_ENDED and e.session]
+        if ended:
+            self.enqueue_many(ended, user_name)
+
+    def next_batch(self, limit: int) -> List[Tuple[int, str]]:
+        """
+        Returns up to `limit` (row id, JSON payload) pairs in queue order, without removing them.
+        """
+        with self._lock:
+            return self._connection.execute(
+                "SELECT id, payload FROM outbox ORDER BY id LIMIT ?", (limit,)
+            ).fetchall()
+
+    def acknowledge(self, row_ids: List[int]) -> None:
+        """
+        Removes rows the endpoint has accepted.
+        """
+        with self._lock:
+            self._connection.executemany("DELETE FROM outbox WHERE id = ?", [(i,) for i in row_ids])
+            self._connection.commit()
+
+    def park(self, row_ids: List[int], reason: str) -> None:
+        """
+        Moves rows the endpoint permanently rejected out of the queue, in one transaction.
+        """
+        with self._lock:
+            self._connection.executemany(
+                "INSERT INTO parked (idempotency_key, payload, reason)"
+                " SELECT idempotency_key, payload, ? FROM outbox WHERE id = ?",
+                [(reason, i) for i in row_ids],
+            )
+            self._connection.executemany("DELETE FROM outbox WHERE id = ?", [(i,) for i in row_ids])
+            self._connection.commit()
+
+    def parked_count(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM parked").fetchone()[0]
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,95 @@
+import http.client
+import json
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+
+class SyncError(Exception):
+    """
+    Raised by a transport when a batch was not accepted and may be retried.
+    """
+
+
+class SyncRejectedError(SyncError):
+    """
+    Raised by a transport when the endpoint permanently refused a batch, so retrying
+    the same batch cannot succeed (e.g. 400 Bad Request, 413 Payload Too Large).
+    """
+
+
+# 4xx responses that describe a temporary condition and are worth retrying.
+RETRYABLE_CLIENT_ERRORS = (408, 425, 429)
+
+
+class SyncTransport(ABC):
+    """
+    Delivers one batch of session records to a central timesheet store.
+    Implementations raise SyncError if the batch was not accepted, or
+    SyncRejectedError if it never will be.
+    """
+
+    @abstractmethod
+    def send_batch(self, records: List[str]) -> None:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class HttpTransport(SyncTransport):
+    """
+    POSTs batches as JSON to an HTTP endpoint over one keep-alive connection.
+
+    Each record carries its own idempotency key; the batch is sent as
+    {"sessions": [...]} and any 2xx response counts as accepted. Other 4xx
+    responses, except RETRYABLE_CLIENT_ERRORS, are permanent rejections.
+    """
+
+    def __init__(self, url: str, timeout: float = 30.0):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported sync URL: {url!r}")
+        self._scheme = parts.scheme
+        self._netloc = parts.netloc
+        self._path = parts.path or "/"
+        self._timeout = timeout
+        self._connection: Optional[http.client.HTTPConnection] = None
+
+    def _get_connection(self) -> http.client.HTTPConnection:
+        if self._connection is None:
+            connection_class = http.client.HTTPSConnection if self._scheme == "https" else http.client.HTTPConnection
+            self._connection = connection_class(self._netloc, timeout=self._timeout)
+        return self._connection
+
+    def send_batch(self, records: List[str]) -> None:
+        # Records are already JSON encoded by the outbox, so they are joined rather than re-encoded.
+        body = ('{"sessions":[' + ",".join(records) + "]}").encode("utf-8")
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+
+        try:
+            connection = self._get_connection()
+            connection.request("POST", self._path, body=body, headers=headers)
+            response = connection.getresponse()
+            response_body = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            # The connection is in an unknown state; open a fresh one on retry.
+            self.close()
+            raise SyncError(f"Sync request failed: {e}") from e
+
+        if 400 <= response.status < 500 and response.status not in RETRYABLE_CLIENT_ERRORS:
+            raise SyncRejectedError(f"Sync endpoint rejected the batch with {response.status}: {response_body[:200]!r}")
+        if not 200 <= response.status < 300:
+            raise SyncError(f"Sync endpoint returned {response.status}: {response_body[:200]!r}")
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def decode_batch(body: bytes) -> List[dict]:
+    """
+    Parses a batch body as sent by HttpTransport.
+    """
+    return json.loads(body)["sessions"]
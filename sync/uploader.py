@@ -0,0 +1,122 @@
+import time
+from typing import Callable, Optional
+
+from sync.outbox import SyncOutbox
+from sync.transport import SyncError, SyncRejectedError, SyncTransport
+
+DEFAULT_BATCH_SIZE = 500
+MAX_ATTEMPTS = 5  # Attempts per batch before the drain stops and leaves the batch queued
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 30.0  # Also the longest wait before a failed drain is retried
+
+
+class SyncReport:
+    """
+    Summary of one drain of the outbox.
+    """
+
+    def __init__(self):
+        self.sent_sessions: int = 0
+        self.sent_batches: int = 0
+        self.retries: int = 0
+        self.parked_sessions: int = 0
+        self.pending_sessions: int = 0
+        self.completed: bool = False
+        self.last_error: str = ""
+
+
+class SyncUploader:
+    """
+    Uploads queued sessions from the outbox in batches, retrying with exponential backoff.
+    Records the endpoint permanently rejects are parked in the outbox instead of retried.
+    Ref: docs/04_output.md (Central Sync)
+    """
+
+    def __init__(
+        self,
+        outbox: SyncOutbox,
+        transport: SyncTransport,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.outbox = outbox
+        self.transport = transport
+        self.batch_size = batch_size
+        # Injected so tests can skip real waiting between retries.
+        self._sleep = sleep
+        self._clock = clock
+        self.failed_drains: int = 0
+        self.next_retry_at: Optional[float] = None
+
+    def drain(self) -> SyncReport:
+        """
+        Sends batches until the outbox is empty or a batch keeps failing.
+        A failed drain leaves unsent sessions queued and schedules the next attempt,
+        see retry_due().
+        """
+        report = SyncReport()
+        while True:
+            batch = self.outbox.next_batch(self.batch_size)
+            if not batch:
+                report.completed = True
+                break
+
+            if not self._deliver(batch, report):
+                break
+
+        report.pending_sessions = self.outbox.pending_count()
+        if report.completed:
+            self.failed_drains = 0
+            self.next_retry_at = None
+        else:
+            # The backoff continues from the last attempt within the drain, up to the cap.
+            delay = min(BACKOFF_BASE_SECONDS * 2 ** (MAX_ATTEMPTS - 1 + self.failed_drains), BACKOFF_MAX_SECONDS)
+            self.failed_drains += 1
+            self.next_retry_at = self._clock() + delay
+        return report
+
+    def retry_due(self) -> bool:
+        """
+        True once the wait after a failed drain has passed. Polled by the app's update loop.
+        """
+        return self.next_retry_at is not None and self._clock() >= self.next_retry_at
+
+    def _deliver(self, batch, report: SyncReport) -> bool:
+        """
+        Sends one batch and acknowledges it. A permanently rejected batch is split in
+        halves until the rejected records are isolated and parked, so the rest still
+        gets through. Returns False if a temporary failure outlasted the retries.
+        """
+        row_ids = [row_id for row_id, _ in batch]
+        records = [payload for _, payload in batch]
+        try:
+            if not self._send_with_retry(records, report):
+                return False
+        except SyncRejectedError as e:
+            report.last_error = str(e)
+            if len(batch) == 1:
+                self.outbox.park(row_ids, str(e))
+                report.parked_sessions += 1
+                return True
+            middle = len(batch) // 2
+            return self._deliver(batch[:middle], report) and self._deliver(batch[middle:], report)
+
+        self.outbox.acknowledge(row_ids)
+        report.sent_sessions += len(row_ids)
+        report.sent_batches += 1
+        return True
+
+    def _send_with_retry(self, records, report: SyncReport) -> bool:
+        for attempt in range(MAX_ATTEMPTS):
+            if attempt > 0:
+                report.retries += 1
+                self._sleep(min(BACKOFF_BASE_SECONDS * 2 ** (attempt - 1), BACKOFF_MAX_SECONDS))
+            try:
+                self.transport.send_batch(records)
+                return True
+            except SyncRejectedError:
+                raise
+            except SyncError as e:
+                report.last_error = str(e)
+        return False
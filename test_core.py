@@ -1,7 +1,8 @@
 import unittest
 from datetime import datetime, timedelta
-from core.engine import CoreEngine, SystemState, MAX_INACTIVITY_SECONDS
-from core.session import SessionEndReason
+from core.engine import CoreEngine, SystemState, MAX_INACTIVITY_SECONDS, INACTIVITY_WARNING_SECONDS
+from core.events import EngineEventType
+from core.session import Session, SessionEndReason
 
 class TestSystemCore(unittest.TestCase):
     def setUp(self):
@@ -87,5 +88,141 @@ class TestSystemCore(unittest.TestCase):
         self.assertEqual(session.end_reason, SessionEndReason.APP_INTERRUPTION)
         self.assertEqual(session.end_time, interruption_time)
 
+    def test_recover_interrupted_session_ends_at_last_activity(self):
+        start_time = datetime(2026, 1, 1, 10, 0, 0)
+        last_activity_time = start_time + timedelta(minutes=42)
+        self.engine.recover_interrupted_session(start_time, "Crashed Task", last_activity_time)
+
+        self.assertEqual(self.engine.state, SystemState.IDLE)
+        self.assertEqual(len(self.engine.completed_sessions), 1)
+        session = self.engine.completed_sessions[0]
+        self.assertEqual(session.task, "Crashed Task")
+        self.assertEqual(session.end_reason, SessionEndReason.APP_INTERRUPTION)
+        self.assertEqual(session.end_time, last_activity_time)
+        self.assertTrue(session.is_complete)
+
+    def test_recover_already_completed_session_is_skipped(self):
+        # Crash after the session was saved but before the checkpoint was cleared.
+        start_time = datetime(2026, 1, 1, 10, 0, 0)
+        self.engine.start_session(task="Saved Task", start_time=start_time)
+        self.engine.stop_session(stop_time=start_time + timedelta(minutes=30))
+
+        self.engine.recover_interrupted_session(start_time, "Saved Task", start_time + timedelta(minutes=29))
+
+        self.assertEqual(len(self.engine.completed_sessions), 1)
+        self.assertEqual(self.engine.completed_sessions[0].end_reason, SessionEndReason.USER_STOPPED)
+
+    def test_recover_interrupted_session_while_active_is_ignored(self):
+        self.engine.start_session(task="Current")
+        self.engine.recover_interrupted_session(datetime(2026, 1, 1, 10, 0, 0), "Old", datetime(2026, 1, 1, 11, 0, 0))
+        self.assertEqual(len(self.engine.completed_sessions), 0)
+        self.assertEqual(self.engine.active_session.task, "Current")
+
+    def test_input_marks_activity_timeline(self):
+        start_time = datetime(2026, 1, 1, 10, 0, 0)
+        self.engine.start_session(start_time=start_time)
+
+        self.engine.handle_input(input_time=start_time + timedelta(seconds=10))
+        self.engine.handle_input(input_time=start_time + timedelta(seconds=50))
+        self.engine.handle_input(input_time=start_time + timedelta(minutes=9, seconds=30))
+        self.engine.stop_session(stop_time=start_time + timedelta(minutes=10))
+
+        session = self.engine.completed_sessions[0]
+        self.assertEqual(session.get_active_minutes(), 2)
+        self.assertEqual(session.get_idle_minutes(), 8)
+
+    def test_activity_timeline_round_trips_through_dict(self):
+        start_time = datetime(2026, 1, 1, 10, 0, 0)
+        session = Session(start_time=start_time)
+        for minute in range(0, 480, 3):
+            session.mark_activity(start_time + timedelta(minutes=minute))
+        session.end(start_time + timedelta(hours=8), SessionEndReason.USER_STOPPED)
+
+        self.assertEqual(len(session.activity_mask), 60)
+        restored = Session.from_dict(session.to_dict())
+        self.assertEqual(restored.get_active_minutes(), 160)
+        self.assertEqual(restored.get_idle_minutes(), 320)
+
+    def test_events_are_delivered_in_batches(self):
+        batches = []
+        self.engine.subscribe(batches.append)
+        start_time = datetime(2026, 1, 1, 10, 0, 0)
+        self.engine.start_session(task="Task", start_time=start_time)
+        self.engine.stop_session(stop_time=start_time + timedelta(minutes=1))
+        self.assertEqual(batches, [])
+
+        self.engine.dispatch_events()
+        self.assertEqual(len(batches), 1)
+        self.assertEqual([e.type for e in batches[0]], [EngineEventType.SESSION_STARTED, EngineEventType.SESSION_ENDED])
+        self.assertEqual(batches[0][1].reason, SessionEndReason.USER_STOPPED)
+
+        self.engine.dispatch_events()
+        self.assertEqual(len(batches), 1)
+
+    def test_inactivity_events(self):
+        events = []
+        self.engine.subscribe(events.extend)
+        start_time = datetime(2026, 1, 1, 10, 0, 0)
+        self.engine.start_session(start_time=start_time)
+
+        warning_time = start_time + timedelta(seconds=INACTIVITY_WARNING_SECONDS + 1)
+        self.engine.tick(current_time=warning_time)
+        self.engine.tick(current_time=warning_time + timedelta(seconds=1))
+        self.engine.handle_input(input_time=warning_time + timedelta(seconds=2))
+        self.engine.handle_input(input_time=warning_time + timedelta(seconds=3))
+        self.engine.tick(current_time=warning_time + timedelta(seconds=2 + MAX_INACTIVITY_SECONDS))
+        self.engine.dispatch_events()
+
+        self.assertEqual([e.type for e in events], [
+            EngineEventType.SESSION_STARTED,
+            EngineEventType.INACTIVITY_WARNING,
+            EngineEventType.INPUT_RESUMED,
+            EngineEventType.SESSION_ENDED,
+        ])
+        self.assertEqual(events[-1].reason, SessionEndReason.INACTIVITY_LIMIT)
+
+    def test_switch_task_closes_and_opens_at_same_time(self):
+        events = []
+        self.engine.subscribe(events.extend)
+        start_time = datetime(2026, 1, 1, 10, 0, 0)
+        self.engine.start_session(task="First", start_time=start_time)
+        self.engine.tick(current_time=start_time + timedelta(seconds=100))
+
+        switch_time = start_time + timedelta(seconds=150)
+        self.engine.switch_task("Second", switch_time=switch_time)
+        self.engine.dispatch_events()
+
+        self.assertEqual(self.engine.state, SystemState.ACTIVE)
+        self.assertEqual(self.engine.completed_sessions[0].task, "First")
+        self.assertEqual(self.engine.completed_sessions[0].end_time, switch_time)
+        self.assertEqual(self.engine.active_session.task, "Second")
+        self.assertEqual(self.engine.active_session.start_time, switch_time)
+        self.assertEqual([e.type for e in events[-2:]], [EngineEventType.SESSION_ENDED, EngineEventType.SESSION_STARTED])
+
+        # Inactivity carries over the switch: 100s before it plus 200s after reaches the limit
+        self.engine.tick(current_time=start_time + timedelta(seconds=300))
+        self.assertEqual(self.engine.state, SystemState.IDLE)
+        self.assertEqual(self.engine.completed_sessions[1].end_reason, SessionEndReason.INACTIVITY_LIMIT)
+
+    def test_switch_near_inactivity_limit_records_only_new_session_inactivity(self):
+        start_time = datetime(2026, 1, 1, 10, 0, 0)
+        self.engine.start_session(task="First", start_time=start_time)
+        switch_time = start_time + timedelta(seconds=MAX_INACTIVITY_SECONDS - 10)
+        self.engine.tick(current_time=switch_time)
+        self.engine.switch_task("Second", switch_time=switch_time)
+        self.engine.tick(current_time=switch_time + timedelta(seconds=10))
+
+        self.assertEqual(self.engine.state, SystemState.IDLE)
+        session = self.engine.completed_sessions[-1]
+        self.assertEqual(session.task, "Second")
+        self.assertEqual(session.end_reason, SessionEndReason.INACTIVITY_LIMIT)
+        self.assertEqual(session.get_duration_seconds(), 10)
+        self.assertEqual(session.max_inactivity_reached_seconds, 10)
+
+    def test_switch_task_while_idle_is_ignored(self):
+        self.engine.switch_task("Task")
+        self.assertEqual(self.engine.state, SystemState.IDLE)
+        self.assertEqual(len(self.engine.completed_sessions), 0)
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,10 +1,15 @@
 import unittest
 import os
+import json
+import shutil
+import tempfile
 import zipfile
 from datetime import datetime, timedelta
 from io import BytesIO
 from pypdf import PdfReader
-from output.generator import OutputGenerator, ADMIN_PASSWORD
+from output.generator import OutputGenerator, ADMIN_PASSWORD, OUTPUT_PROFILES
+from output.consolidate import consolidate_packages
+from output.manifest import MANIFEST_NAME, build_manifest
 from core.session import Session, SessionEndReason
 
 class TestOutputGenerator(unittest.TestCase):
@@ -26,7 +31,7 @@ class TestOutputGenerator(unittest.TestCase):
         if os.path.exists(self.test_zip):
             os.remove(self.test_zip)
 
-    def test_generate_package_creates_zip_with_two_pdfs(self):
+    def test_generate_package_creates_zip_with_two_pdfs_and_manifest(self):
         self.generator.generate_package(self.sessions, self.test_zip, hourly_rate=500.0)
         self.assertTrue(os.path.exists(self.test_zip))
         
@@ -34,7 +39,119 @@ class TestOutputGenerator(unittest.TestCase):
             file_list = zf.namelist()
             self.assertIn("invoice.pdf", file_list)
             self.assertIn("administrative_record.pdf", file_list)
-            self.assertEqual(len(file_list), 2)
+            self.assertIn(MANIFEST_NAME, file_list)
+            self.assertEqual(len(file_list), 3)
+
+    def test_manifest_totals_match_sessions(self):
+        self.generator.generate_package(self.sessions, self.test_zip, user_name="Ana", hourly_rate=500.0)
+
+        with zipfile.ZipFile(self.test_zip, 'r') as zf:
+            manifest = json.loads(zf.read(MANIFEST_NAME))
+
+        self.assertEqual(manifest["user_name"], "Ana")
+        self.assertEqual(manifest["session_count"], 2)
+        self.assertEqual(manifest["total_seconds"], 35 * 60)
+        self.assertEqual(manifest["amount_to_be_paid"], round(500.0 * 35 / 60, 2))
+        self.assertEqual(manifest["period_start"], "2026-01-01T10:00:00")
+        self.assertEqual(manifest["period_end"], "2026-01-01T11:05:00")
+        # The manifest is unencrypted, so like the invoice it carries no inactivity details
+        self.assertEqual(manifest["rows"][1], ["2026-01-01T11:00:00", "2026-01-01T11:05:00", 300, "Task 2"])
+        self.assertNotIn("inactivity", json.dumps(manifest))
+
+    def test_consolidate_packages_combines_manifests(self):
+        package_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, package_dir)
+        self.generator.generate_package(self.sessions, os.path.join(package_dir, "a1.zip"), user_name="Ana", hourly_rate=500.0)
+        self.generator.generate_package(self.sessions[:1], os.path.join(package_dir, "a2.zip"), user_name="Ana", hourly_rate=500.0)
+        self.generator.generate_package(self.sessions, os.path.join(package_dir, "b.zip"), user_name="Ben", hourly_rate=300.0)
+
+        # A package whose totals were edited no longer matches its row digest
+        with zipfile.ZipFile(os.path.join(package_dir, "b.zip")) as zf:
+            manifest = json.loads(zf.read(MANIFEST_NAME))
+        manifest["rows"][0][2] = 99999
+        with zipfile.ZipFile(os.path.join(package_dir, "tampered.zip"), 'w') as zf:
+            zf.writestr(MANIFEST_NAME, json.dumps(manifest))
+
+        # A second copy of a package is counted once
+        shutil.copyfile(os.path.join(package_dir, "a2.zip"), os.path.join(package_dir, "a2 copy.zip"))
+
+        summary = consolidate_packages(package_dir)
+
+        self.assertEqual(summary.package_count, 3)
+        self.assertEqual(summary.contractors["Ana"].package_count, 2)
+        self.assertEqual(summary.contractors["Ana"].total_seconds, 65 * 60)
+        self.assertEqual(summary.contractors["Ben"].total_seconds, 35 * 60)
+        self.assertEqual(summary.invalid_packages, [
+            ("a2.zip", "duplicate of a2 copy.zip"),
+            ("tampered.zip", "row digest does not match"),
+        ])
+        self.assertEqual(summary.amount_to_be_paid, round(500.0 * 65 / 60, 2) + round(300.0 * 35 / 60, 2))
+
+        report_path = os.path.join(package_dir, "team_report.pdf")
+        self.generator.generate_team_report(summary, report_path)
+        text = PdfReader(report_path).pages[0].extract_text()
+        self.assertIn("TEAM INVOICE", text)
+        self.assertIn("Ben", text)
+
+    def test_malformed_manifests_are_reported_not_raised(self):
+        package_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, package_dir)
+        with zipfile.ZipFile(os.path.join(package_dir, "list.zip"), 'w') as zf:
+            zf.writestr(MANIFEST_NAME, "[]")
+        with zipfile.ZipFile(os.path.join(package_dir, "rows.zip"), 'w') as zf:
+            zf.writestr(MANIFEST_NAME, json.dumps({"format": "timetickit-package", "version": 1, "rows": {}}))
+
+        # Corrupt the deflated manifest data, leaving the ZIP structure intact
+        corrupt_path = os.path.join(package_dir, "corrupt.zip")
+        with zipfile.ZipFile(corrupt_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr(MANIFEST_NAME, json.dumps({"rows": list(range(1000))}))
+            data_offset = 30 + len(MANIFEST_NAME)
+        with open(corrupt_path, "r+b") as f:
+            f.seek(data_offset)
+            f.write(b"\xff" * 16)
+
+        summary = consolidate_packages(package_dir)
+
+        self.assertEqual(summary.package_count, 0)
+        reasons = dict(summary.invalid_packages)
+        self.assertEqual(set(reasons), {"list.zip", "rows.zip", "corrupt.zip"})
+        self.assertEqual(reasons["list.zip"], "manifest is not a JSON object")
+        self.assertTrue(reasons["corrupt.zip"].startswith("unreadable package"))
+
+    def test_mistyped_manifest_fields_are_reported_not_raised(self):
+        package_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, package_dir)
+        # Each edit leaves the rows, and so the row digest, intact
+        edits = {
+            "user_name": ["Ana"],
+            "invoice_id": 7,
+            "hourly_rate": "500",
+            "amount_to_be_paid": None,
+            "total_seconds": True,
+            "session_count": 2.0,
+            "period_start": 5,
+            "period_end": None,
+        }
+        for field, value in edits.items():
+            manifest = build_manifest(self.sessions, "Ana", 500.0, datetime(2026, 1, 2), invoice_id="INV-1")
+            manifest[field] = value
+            with zipfile.ZipFile(os.path.join(package_dir, f"{field}.zip"), 'w') as zf:
+                zf.writestr(MANIFEST_NAME, json.dumps(manifest))
+        self.generator.generate_package(self.sessions, os.path.join(package_dir, "valid.zip"), user_name="Ben")
+
+        summary = consolidate_packages(package_dir)
+
+        self.assertEqual(list(summary.contractors), ["Ben"])
+        reasons = dict(summary.invalid_packages)
+        self.assertEqual(set(reasons), {f"{field}.zip" for field in edits})
+        self.assertEqual(reasons["user_name.zip"], "user_name must be a string")
+        self.assertEqual(reasons["invoice_id.zip"], "invoice_id must be a string or null")
+        self.assertEqual(reasons["hourly_rate.zip"], "hourly_rate must be a number")
+        self.assertEqual(reasons["amount_to_be_paid.zip"], "amount_to_be_paid must be a number")
+        self.assertEqual(reasons["total_seconds.zip"], "total_seconds must be an integer")
+        self.assertEqual(reasons["session_count.zip"], "session_count must be an integer")
+        self.assertEqual(reasons["period_start.zip"], "period_start does not match rows")
+        self.assertEqual(reasons["period_end.zip"], "period_end does not match rows")
 
     def test_administrative_record_is_encrypted(self):
         self.generator.generate_package(self.sessions, self.test_zip, hourly_rate=500.0)
@@ -58,5 +175,20 @@ class TestOutputGenerator(unittest.TestCase):
         reader = PdfReader(BytesIO(invoice_pdf_data))
         self.assertFalse(reader.is_encrypted)
 
+    def test_every_output_profile_produces_valid_package(self):
+        for profile in OUTPUT_PROFILES:
+            OutputGenerator(profile=profile).generate_package(self.sessions, self.test_zip, hourly_rate=500.0)
+            with zipfile.ZipFile(self.test_zip, 'r') as zf:
+                self.assertIsNone(zf.testzip())
+                invoice = PdfReader(BytesIO(zf.read("invoice.pdf")))
+                admin_record = PdfReader(BytesIO(zf.read("administrative_record.pdf")))
+            self.assertIn("ACCUMULATED SESSION TIME", invoice.pages[0].extract_text())
+            self.assertTrue(admin_record.decrypt(ADMIN_PASSWORD))
+            self.assertIn("ADMINISTRATIVE RECORD", admin_record.pages[0].extract_text())
+
+    def test_unknown_output_profile_is_rejected(self):
+        with self.assertRaises(ValueError):
+            OutputGenerator(profile="tiny")
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from status.block import (
+    StatusBlockReader, StatusBlockWriter, SEQUENCE_FIELD, SEQUENCE_OFFSET,
+    STATE_ACTIVE, STATE_IDLE, STATE_NOT_RUNNING,
+)
+
+class TestStatusBlock(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "status.bin"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_reader_without_block_returns_none(self):
+        self.assertIsNone(StatusBlockReader(self.path).read())
+
+    def test_reader_sees_published_status(self):
+        writer = StatusBlockWriter(self.path)
+        reader = StatusBlockReader(self.path)
+        session_start = datetime(2026, 1, 1, 9, 0, 0)
+        writer.publish(STATE_ACTIVE, task="Invoices", session_start=session_start, inactivity_seconds=200,
+                       max_inactivity_seconds=300, today_total_seconds=5400, updated_at=datetime(2026, 1, 1, 10, 30, 0))
+
+        status = reader.read()
+        self.assertEqual(status.state_name, "ACTIVE")
+        self.assertEqual(status.task, "Invoices")
+        self.assertEqual(status.session_start, session_start)
+        self.assertEqual(status.today_total_seconds, 5400)
+        self.assertEqual(status.seconds_until_auto_end, 100)
+
+        writer.publish(STATE_IDLE, today_total_seconds=6000)
+        status = reader.read()
+        self.assertEqual(status.state, STATE_IDLE)
+        self.assertIsNone(status.session_start)
+        self.assertIsNone(status.seconds_until_auto_end)
+
+        writer.close()
+        self.assertEqual(reader.read().state, STATE_NOT_RUNNING)
+        reader.close()
+
+    def test_block_left_by_crashed_app_is_stale(self):
+        writer = StatusBlockWriter(self.path)
+        updated_at = datetime(2026, 1, 1, 10, 30, 0)
+        writer.publish(STATE_ACTIVE, task="Invoices", session_start=updated_at, max_inactivity_seconds=300,
+                       updated_at=updated_at)
+
+        # The writer is never closed, as after a crash.
+        reader = StatusBlockReader(self.path)
+        status = reader.read()
+        self.assertEqual(status.state, STATE_ACTIVE)
+        self.assertFalse(status.is_stale(now=updated_at + timedelta(seconds=2)))
+        self.assertTrue(status.is_stale(now=updated_at + timedelta(minutes=5)))
+        reader.close()
+        writer.close()
+
+    def test_reader_does_not_return_torn_write(self):
+        writer = StatusBlockWriter(self.path)
+        writer.publish(STATE_IDLE)
+        reader = StatusBlockReader(self.path)
+
+        # Simulate a writer stopped halfway through a publish (odd sequence)
+        SEQUENCE_FIELD.pack_into(writer._map, SEQUENCE_OFFSET, 3)
+        self.assertIsNone(reader.read())
+        reader.close()
+        writer.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,255 @@
+import unittest
+import os
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+from core.session import Session, SessionEndReason
+from storage.checkpoint import SessionCheckpoint, RECORD, TASK_FIELD_BYTES
+from storage.history import SessionHistory
+from storage.importer import import_sessions
+from storage.ledger import InvoiceLedger
+
+class TestSessionCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "active_session.chk"
+        self.checkpoint = SessionCheckpoint(self.path)
+
+    def tearDown(self):
+        self.checkpoint.close()
+        self.temp_dir.cleanup()
+
+    def test_empty_checkpoint_reads_none(self):
+        self.assertIsNone(self.checkpoint.read())
+
+    def test_checkpoint_round_trip_with_touch(self):
+        start_time = datetime(2026, 1, 1, 10, 0, 0, 123456)
+        self.checkpoint.write_session(Session(start_time=start_time, task="Design review"))
+
+        last_activity_time = start_time + timedelta(minutes=17, seconds=3)
+        self.checkpoint.touch(last_activity_time)
+
+        self.assertEqual(os.path.getsize(self.path), RECORD.size)
+        self.assertEqual(self.checkpoint.read(), (start_time, "Design review", last_activity_time))
+
+    def test_checkpoint_survives_without_close(self):
+        start_time = datetime(2026, 1, 1, 10, 0, 0)
+        self.checkpoint.write_session(Session(start_time=start_time, task="Task"))
+        self.checkpoint.touch(start_time + timedelta(seconds=5))
+
+        # A fresh reader sees the record as a restarted app would after a crash.
+        reopened = SessionCheckpoint(self.path)
+        self.assertEqual(reopened.read()[2], start_time + timedelta(seconds=5))
+
+    def test_clear_removes_active_session(self):
+        self.checkpoint.write_session(Session(start_time=datetime(2026, 1, 1, 10, 0, 0), task="Task"))
+        self.checkpoint.clear()
+        self.assertIsNone(self.checkpoint.read())
+
+    def test_long_task_is_truncated(self):
+        task = "é" * TASK_FIELD_BYTES
+        self.checkpoint.write_session(Session(start_time=datetime(2026, 1, 1, 10, 0, 0), task=task))
+        _, stored_task, _ = self.checkpoint.read()
+        self.assertEqual(stored_task, "é" * (TASK_FIELD_BYTES // 2))
+
+class TestSessionImport(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.history = SessionHistory(Path(self.temp_dir.name) / "history.sqlite3")
+
+    def tearDown(self):
+        self.history.close()
+        self.temp_dir.cleanup()
+
+    def write_file(self, name, content):
+        path = Path(self.temp_dir.name) / name
+        path.write_text(content, encoding="utf-8")
+        return path
+
+    def test_csv_import_validates_and_dedupes(self):
+        path = self.write_file("timesheet.csv", (
+            "start_time,end_time,task,end_reason\n"
+            "2025-03-01T09:00:00,2025-03-01T10:00:00,Design,USER_STOPPED\n"
+            "2025-03-01T11:00:00,2025-03-01T11:30:00,Review,2\n"
+            "2025-03-01T11:00:00,2025-03-01T11:30:00,Review,2\n"
+            "2025-03-01T12:00:00,2025-03-01T12:00:00,Zero,\n"
+            "2025-03-01T13:00:00,2025-03-01T14:00:00,Bad reason,PAUSED\n"
+            "not a date,2025-03-01T14:00:00,Broken,\n"
+        ))
+        report = import_sessions(path, self.history, batch_size=2)
+
+        self.assertEqual(report.rows_read, 6)
+        self.assertEqual(report.imported, 2)
+        self.assertEqual(report.duplicates, 1)
+        self.assertEqual(report.rejected, 3)
+        self.assertEqual([line for line, _ in report.rejects], [5, 6, 7])
+
+        sessions = list(self.history.iter_sessions())
+        self.assertEqual([s.task for s in sessions], ["Design", "Review"])
+        self.assertEqual(sessions[1].end_reason, SessionEndReason.INACTIVITY_LIMIT)
+
+    def test_jsonl_import_dedupes_against_existing_history(self):
+        existing = Session(start_time=datetime(2025, 3, 1, 9, 0, 0), task="Design")
+        existing.end(datetime(2025, 3, 1, 10, 0, 0), SessionEndReason.USER_STOPPED)
+        path = self.write_file("timesheet.jsonl", (
+            '{"start_time": "2025-03-01T09:00:00", "end_time": "2025-03-01T10:00:00", "task": "Design"}\n'
+            '{"start_time": "2025-03-02T09:00:00", "end_time": "2025-03-02T10:00:00", "task": "Build"}\n'
+            '{"start_time": "2025-03-02T09:00:00"\n'
+        ))
+        rejects_path = Path(self.temp_dir.name) / "rejects.csv"
+        report = import_sessions(path, self.history, existing_sessions=[existing], rejects_path=rejects_path)
+
+        self.assertEqual(report.imported, 1)
+        self.assertEqual(report.duplicates, 1)
+        self.assertEqual(report.rejects, [(3, "invalid JSON")])
+        self.assertIn("invalid JSON", rejects_path.read_text(encoding="utf-8"))
+
+        # Importing the same file again adds nothing
+        report = import_sessions(path, self.history, existing_sessions=[existing])
+        self.assertEqual(report.imported, 0)
+        self.assertEqual(self.history.count(), 1)
+
+    def test_import_skips_sessions_already_invoiced(self):
+        invoiced = Session(start_time=datetime(2025, 3, 1, 9, 0, 0), task="Design")
+        invoiced.end(datetime(2025, 3, 1, 10, 0, 0), SessionEndReason.USER_STOPPED)
+        ledger = InvoiceLedger(Path(self.temp_dir.name) / "ledger")
+        ledger.seal("INV-1", [invoiced])
+        path = self.write_file("timesheet.csv", (
+            "start_time,end_time,task\n"
+            "2025-03-01T09:00:00,2025-03-01T10:00:00,Design\n"
+            "2025-03-01T11:00:00,2025-03-01T12:00:00,Review\n"
+        ))
+        report = import_sessions(path, self.history, ledger=ledger)
+
+        self.assertEqual(report.imported, 1)
+        self.assertEqual(report.duplicates, 1)
+        self.assertEqual([s.task for s in self.history.iter_sessions()], ["Review"])
+
+    def test_oversized_csv_field_is_rejected_per_row(self):
+        path = self.write_file("timesheet.csv", (
+            "start_time,end_time,task\n"
+            "2025-03-01T09:00:00,2025-03-01T10:00:00," + "x" * 200000 + "\n"
+            "2025-03-02T09:00:00,2025-03-02T10:00:00,Build\n"
+        ))
+        report = import_sessions(path, self.history)
+
+        self.assertEqual(report.imported, 1)
+        self.assertEqual(report.rejected, 1)
+        self.assertEqual(report.rejects[0][0], 2)
+        self.assertIn("unreadable CSV row", report.rejects[0][1])
+
+    def test_imported_sessions_can_be_read_back_by_period(self):
+        path = self.write_file("timesheet.csv", (
+            "start_time,end_time,task\n"
+            "2025-02-28T09:00:00,2025-02-28T10:00:00,February\n"
+            "2025-03-01T09:00:00,2025-03-01T09:30:00.250000,March\n"
+            "2025-04-01T09:00:00,2025-04-01T09:15:00,April\n"
+        ))
+        import_sessions(path, self.history)
+
+        self.assertEqual(self.history.summary(), (3, 3600 + 1800 + 900))
+        march = list(self.history.iter_sessions(datetime(2025, 3, 1), datetime(2025, 4, 1)))
+        self.assertEqual([s.task for s in march], ["March"])
+
+    def test_mistyped_rows_are_rejected_without_aborting(self):
+        path = self.write_file("timesheet.jsonl", (
+            '{"start_time": "2025-03-01T09:00:00", "end_time": "2025-03-01T10:00:00+00:00"}\n'
+            '{"start_time": "2025-03-01T09:00:00", "end_time": "2025-03-01T10:00:00", "end_reason": true}\n'
+            '{"start_time": "2025-03-01T09:00:00", "end_time": "2025-03-01T10:00:00", "task": ["a"]}\n'
+            '{"start_time": 20250101, "end_time": "2025-01-01T10:00:00"}\n'
+            '{"start_time": "2025-03-02T09:00:00", "end_time": "2025-03-02T10:00:00", "task": "Build"}\n'
+        ))
+        report = import_sessions(path, self.history)
+
+        self.assertEqual(report.imported, 1)
+        self.assertEqual([line for line, _ in report.rejects], [1, 2, 3, 4])
+        self.assertEqual(report.rejects[3][1], "start_time and end_time must be ISO 8601 strings")
+        self.assertIn("UTC offset", report.rejects[0][1])
+        self.assertEqual(report.rejects[2][1], "task must be a string")
+
+    def test_unsupported_file_type_is_rejected(self):
+        path = self.write_file("timesheet.xlsx", "")
+        with self.assertRaises(ValueError):
+            import_sessions(path, self.history)
+
+class TestInvoiceLedger(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.ledger_dir = Path(self.temp_dir.name) / "ledger"
+        self.ledger = InvoiceLedger(self.ledger_dir)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_sessions(self, day, count=3):
+        sessions = []
+        for i in range(count):
+            session = Session(start_time=day + timedelta(hours=i), task=f"Task {i}")
+            session.end(session.start_time + timedelta(minutes=30), SessionEndReason.USER_STOPPED)
+            sessions.append(session)
+        return sessions
+
+    def test_sealed_invoice_can_be_queried_after_reopening(self):
+        self.ledger.seal("INV-1", self.make_sessions(datetime(2025, 1, 6, 9, 0, 0)))
+        self.ledger.seal("INV-2", self.make_sessions(datetime(2025, 1, 13, 9, 0, 0), count=2))
+
+        reopened = InvoiceLedger(self.ledger_dir)
+        self.assertEqual(set(reopened.list_invoices()), {"INV-1", "INV-2"})
+        self.assertEqual(reopened.list_invoices()["INV-2"]["total_seconds"], 2 * 30 * 60)
+        self.assertEqual([s.task for s in reopened.get_invoice("INV-1")], ["Task 0", "Task 1", "Task 2"])
+
+        in_period = list(reopened.query_period(datetime(2025, 1, 13), datetime(2025, 1, 14)))
+        self.assertEqual([(i, s.task) for i, s in in_period], [("INV-2", "Task 0"), ("INV-2", "Task 1")])
+
+    def test_sealing_same_invoice_twice_is_rejected(self):
+        self.ledger.seal("INV-1", self.make_sessions(datetime(2025, 1, 6, 9, 0, 0)))
+        with self.assertRaises(ValueError):
+            self.ledger.seal("INV-1", self.make_sessions(datetime(2025, 1, 7, 9, 0, 0)))
+
+    def test_next_invoice_id_is_unique_within_a_second(self):
+        export_time = datetime(2026, 1, 1, 9, 30, 0)
+        first_id = self.ledger.next_invoice_id(export_time)
+        self.ledger.seal(first_id, self.make_sessions(datetime(2025, 1, 6, 9, 0, 0)))
+        second_id = self.ledger.next_invoice_id(export_time)
+        self.ledger.seal(second_id, self.make_sessions(datetime(2025, 1, 7, 9, 0, 0)))
+
+        self.assertEqual(first_id, "INV-20260101-093000")
+        self.assertEqual(second_id, "INV-20260101-093000-2")
+        self.assertEqual(self.ledger.next_invoice_id(export_time), "INV-20260101-093000-3")
+
+    def test_seal_pending_finishes_export_interrupted_before_index_was_saved(self):
+        sessions = self.make_sessions(datetime(2025, 1, 6, 9, 0, 0))
+        # Segment written, but the app stopped before the index was saved
+        with patch.object(InvoiceLedger, "_save_index", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.ledger.seal("INV-1", sessions)
+        self.assertEqual(len(list((self.ledger_dir / "segments").iterdir())), 1)
+
+        reopened = InvoiceLedger(self.ledger_dir)
+        self.assertFalse(reopened.is_sealed("INV-1"))
+        self.assertTrue(reopened.seal_pending("INV-1", sessions))
+        self.assertEqual([s.task for s in InvoiceLedger(self.ledger_dir).get_invoice("INV-1")], ["Task 0", "Task 1", "Task 2"])
+
+        # Sealed, but the app stopped before the sessions were removed from config.json
+        self.assertFalse(reopened.seal_pending("INV-1", sessions))
+        self.assertEqual(len(reopened.get_invoice("INV-1")), 3)
+
+    def test_compact_merges_closed_months_only(self):
+        self.ledger.seal("INV-1", self.make_sessions(datetime(2025, 1, 6, 9, 0, 0)))
+        self.ledger.seal("INV-2", self.make_sessions(datetime(2025, 1, 20, 9, 0, 0)))
+        self.ledger.seal("INV-3", self.make_sessions(datetime(2025, 2, 3, 9, 0, 0)))
+        self.ledger.seal("INV-4", self.make_sessions(datetime(2025, 2, 10, 9, 0, 0)))
+
+        removed = self.ledger.compact(before=datetime(2025, 2, 15))
+
+        self.assertEqual(removed, 2)
+        segments = sorted(p.name for p in (self.ledger_dir / "segments").iterdir())
+        self.assertEqual(len(segments), 3)
+        reopened = InvoiceLedger(self.ledger_dir)
+        self.assertEqual(reopened.list_invoices()["INV-1"]["segment"], reopened.list_invoices()["INV-2"]["segment"])
+        self.assertEqual(len(reopened.get_invoice("INV-2")), 3)
+        self.assertEqual(len(list(reopened.query_period(datetime(2025, 1, 1), datetime(2025, 3, 1)))), 12)
+
+if __name__ == "__main__":
+    unittest.main()
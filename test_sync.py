@@ -0,0 +1,112 @@
+import unittest
+import os
+import tempfile
+from datetime import datetime, timedelta
+from core.engine import CoreEngine
+from sync.local_server import LocalSyncServer
+from sync.outbox import SyncOutbox
+from sync.transport import HttpTransport
+from sync.transport import SyncTransport
+from sync.uploader import SyncUploader, MAX_ATTEMPTS, BACKOFF_MAX_SECONDS
+
+class TestSync(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.outbox_path = os.path.join(self.temp_dir.name, "outbox.sqlite3")
+        self.outbox = SyncOutbox(self.outbox_path)
+        self.server = LocalSyncServer().start()
+        self.transport = HttpTransport(self.server.url)
+        self.sleeps = []
+
+        # Sessions reach the outbox through engine events
+        self.engine = CoreEngine()
+        self.engine.subscribe(lambda events: self.outbox.record_ended_sessions(events, "Employee"))
+        start_time = datetime(2026, 1, 1, 10, 0, 0)
+        for i in range(5):
+            session_start = start_time + timedelta(hours=i)
+            self.engine.start_session(task=f"Task {i}", start_time=session_start)
+            self.engine.stop_session(stop_time=session_start + timedelta(minutes=30))
+        self.engine.dispatch_events()
+
+    def tearDown(self):
+        self.transport.close()
+        self.server.stop()
+        self.outbox.close()
+        self.temp_dir.cleanup()
+
+    def make_uploader(self, outbox):
+        return SyncUploader(outbox, self.transport, batch_size=2, sleep=self.sleeps.append)
+
+    def test_drain_uploads_all_sessions_in_batches(self):
+        report = self.make_uploader(self.outbox).drain()
+
+        self.assertTrue(report.completed)
+        self.assertEqual(report.sent_sessions, 5)
+        self.assertEqual(report.sent_batches, 3)
+        self.assertEqual(report.pending_sessions, 0)
+        self.assertEqual(len(self.server.records), 5)
+        self.assertEqual({r["task"] for r in self.server.records.values()}, {f"Task {i}" for i in range(5)})
+
+    def test_failed_batches_are_retried_with_backoff(self):
+        self.server.fail_next_requests(2)
+        report = self.make_uploader(self.outbox).drain()
+
+        self.assertTrue(report.completed)
+        self.assertEqual(report.retries, 2)
+        self.assertEqual(self.sleeps, [0.5, 1.0])
+        self.assertEqual(len(self.server.records), 5)
+
+    def test_drain_resumes_after_restart(self):
+        self.server.fail_next_requests(MAX_ATTEMPTS)
+        report = self.make_uploader(self.outbox).drain()
+        self.assertFalse(report.completed)
+        self.assertEqual(report.pending_sessions, 5)
+        self.outbox.close()
+
+        self.outbox = SyncOutbox(self.outbox_path)
+        report = self.make_uploader(self.outbox).drain()
+        self.assertTrue(report.completed)
+        self.assertEqual(len(self.server.records), 5)
+
+    def test_failed_drain_schedules_capped_retry(self):
+        now = [0.0]
+        uploader = SyncUploader(self.outbox, self.transport, batch_size=2, sleep=self.sleeps.append,
+                                clock=lambda: now[0])
+        self.server.fail_next_requests(MAX_ATTEMPTS * 3)
+        for _ in range(3):
+            self.assertFalse(uploader.drain().completed)
+        self.assertEqual(uploader.next_retry_at, BACKOFF_MAX_SECONDS)
+        self.assertFalse(uploader.retry_due())
+
+        now[0] = BACKOFF_MAX_SECONDS
+        self.assertTrue(uploader.retry_due())
+        self.assertTrue(uploader.drain().completed)
+        self.assertFalse(uploader.retry_due())
+        self.assertEqual(len(self.server.records), 5)
+
+    def test_permanently_rejected_sessions_are_parked(self):
+        self.server.reject_task("Task 3")
+        report = self.make_uploader(self.outbox).drain()
+
+        self.assertTrue(report.completed)
+        self.assertEqual(report.sent_sessions, 4)
+        self.assertEqual(report.parked_sessions, 1)
+        self.assertEqual(report.retries, 0)
+        self.assertEqual(self.outbox.pending_count(), 0)
+        self.assertEqual(self.outbox.parked_count(), 1)
+        self.assertEqual({r["task"] for r in self.server.records.values()}, {"Task 0", "Task 1", "Task 2", "Task 4"})
+
+    def test_transport_must_implement_send_batch(self):
+        with self.assertRaises(TypeError):
+            SyncTransport()
+
+    def test_resent_sessions_are_stored_once(self):
+        self.make_uploader(self.outbox).drain()
+        self.outbox.enqueue_many(self.engine.completed_sessions, "Employee")
+        self.make_uploader(self.outbox).drain()
+
+        self.assertEqual(len(self.server.records), 5)
+        self.assertEqual(self.server.duplicates_received, 5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,17 +1,29 @@
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-from datetime import datetime
+from tkinter import ttk, filedialog, messagebox, simpledialog
+from datetime import datetime, timedelta
 import os
 import json
+import sqlite3
 import webbrowser
 from PIL import Image, ImageTk
 from pynput import mouse, keyboard
 import sys
+import threading
 from pathlib import Path
 
-from core.engine import CoreEngine, SystemState, MAX_INACTIVITY_SECONDS
+from core.engine import CoreEngine, SystemState, MAX_INACTIVITY_SECONDS, INACTIVITY_WARNING_SECONDS
+from core.events import EngineEventType
 from core.session import SessionEndReason
-from output.generator import OutputGenerator
+from output.consolidate import read_package_manifest
+from output.generator import OutputGenerator, OUTPUT_PROFILES, DEFAULT_OUTPUT_PROFILE
+from storage.checkpoint import SessionCheckpoint
+from sync.outbox import SyncOutbox
+from sync.transport import HttpTransport
+from sync.uploader import SyncUploader
+from storage.history import SessionHistory
+from storage.importer import import_sessions
+from storage.ledger import InvoiceLedger
+from status.block import StatusBlockWriter, STATE_ACTIVE, STATE_IDLE
 
 def _app_base_dir() -> Path:
     """
@@ -33,6 +45,11 @@ def _user_data_dir() -> Path:
 APP_BASE_DIR = _app_base_dir()
 USER_DATA_DIR = _user_data_dir()
 CONFIG_FILE = USER_DATA_DIR / "config.json"
+CHECKPOINT_FILE = USER_DATA_DIR / "active_session.chk"
+SYNC_OUTBOX_FILE = USER_DATA_DIR / "sync_outbox.sqlite3"
+STATUS_BLOCK_FILE = USER_DATA_DIR / "status.bin"
+HISTORY_FILE = USER_DATA_DIR / "history.sqlite3"
+LEDGER_DIR = USER_DATA_DIR / "ledger"
 
 AVATARS = ["cat.png", "dog.png", "fox.png", "panda.png"]
 ASSETS_DIR = APP_BASE_DIR / "assets"
@@ -41,12 +58,26 @@ class TimeTickItApp:
     def __init__(self, root):
         self.root = root
         self.root.title("TimeTickIt")
-        self.root.geometry("320x400")
+        self.root.geometry("320x440")
         
         self.engine = CoreEngine()
-        self.generator = OutputGenerator()
+        self.checkpoint = SessionCheckpoint(CHECKPOINT_FILE)
+        self.status_block = StatusBlockWriter(STATUS_BLOCK_FILE)
+        self.ledger = InvoiceLedger(LEDGER_DIR)
+        self._invoiced_today = None  # (date, seconds) of today's sessions already sealed in the ledger
+        self.sync_uploader = None
+        self._sync_thread = None
+        self.engine.subscribe(self.on_engine_events)
         
         self.load_config()
+        try:
+            self.finish_pending_invoice()
+        except (OSError, ValueError):
+            # Retried before the next export; the sessions stay in the hot set meanwhile.
+            pass
+        self.setup_output()
+        self.setup_sync()
+        self.recover_interrupted_session()
         self.setup_ui()
         self.update_loop()
         
@@ -90,6 +121,121 @@ class TimeTickItApp:
         from core.session import Session
         self.engine.completed_sessions = [Session.from_dict(s) for s in saved_sessions]
 
+    def finish_pending_invoice(self):
+        """
+        Completes an export that stopped before its sessions left config.json.
+
+        "pending_invoice" is saved before the package is written. If the package exists
+        with that invoice id (or the invoice is already sealed), its sessions are sealed
+        under that id and removed from the hot set; otherwise the export never happened
+        and the sessions stay uninvoiced. Raises OSError/ValueError if the ledger cannot
+        be written, leaving the marker for the next attempt.
+        """
+        pending = self.config.get("pending_invoice")
+        if not pending:
+            return
+
+        invoice_id, session_count = pending["invoice_id"], pending["session_count"]
+        if self.ledger.is_sealed(invoice_id) or self._package_has_invoice(pending["package_path"], invoice_id):
+            # Sessions are only ever appended, so the invoiced ones come first.
+            self.ledger.seal_pending(invoice_id, self.engine.completed_sessions[:session_count])
+            self.engine.completed_sessions = self.engine.completed_sessions[session_count:]
+            self._invoiced_today = None
+        del self.config["pending_invoice"]
+        self.save_config()
+
+    @staticmethod
+    def _package_has_invoice(package_path, invoice_id):
+        try:
+            return read_package_manifest(Path(package_path)).get("invoice_id") == invoice_id
+        except ValueError:
+            # Missing, partly written or unreadable: the package was not delivered.
+            return False
+
+    def setup_output(self):
+        """
+        Builds the output generator with the "output_profile" set in config.json.
+        An unknown profile falls back to the default rather than blocking exports.
+        """
+        profile = self.config.get("output_profile", DEFAULT_OUTPUT_PROFILE)
+        if profile not in OUTPUT_PROFILES:
+            profile = DEFAULT_OUTPUT_PROFILE
+        self.generator = OutputGenerator(profile=profile)
+
+    def setup_sync(self):
+        """
+        Enables uploads to a central timesheet store when "sync_url" is set in config.json.
+        """
+        sync_url = self.config.get("sync_url")
+        if not sync_url:
+            return
+
+        outbox = SyncOutbox(SYNC_OUTBOX_FILE)
+        self.sync_uploader = SyncUploader(outbox, HttpTransport(sync_url))
+        # Resume anything left queued by a previous run.
+        self.start_sync()
+
+    def start_sync(self):
+        """
+        Drains the sync outbox on a background thread, unless a drain is already running.
+        """
+        if not self.sync_uploader:
+            return
+        if self._sync_thread and self._sync_thread.is_alive():
+            return
+
+        self._sync_thread = threading.Thread(target=self.sync_uploader.drain, daemon=True)
+        self._sync_thread.start()
+
+    def recover_interrupted_session(self):
+        """
+        Closes a session that was still active when the app last crashed or lost power.
+        """
+        checkpointed = self.checkpoint.read()
+        if not checkpointed:
+            return
+
+        start_time, task, last_activity_time = checkpointed
+        self.engine.recover_interrupted_session(start_time, task, last_activity_time)
+        self.engine.dispatch_events()
+
+    def on_engine_events(self, events):
+        """
+        Reacts to a batch of engine events: persists ended sessions once per batch,
+        then points the checkpoint at whichever session is active after the batch,
+        and shows the auto-end notification.
+        """
+        session_ended = False
+        ended_by_inactivity = False
+        checkpoint_changed = False
+        for event in events:
+            if event.type == EngineEventType.SESSION_STARTED:
+                checkpoint_changed = True
+            elif event.type == EngineEventType.SESSION_ENDED:
+                checkpoint_changed = True
+                session_ended = True
+                if event.reason == SessionEndReason.INACTIVITY_LIMIT:
+                    ended_by_inactivity = True
+
+        # Saved before the checkpoint is updated. A crash in between leaves a checkpoint for a
+        # session that is already completed, which recovery recognises and skips.
+        if session_ended:
+            self.save_config()
+            if self.sync_uploader:
+                self.sync_uploader.outbox.record_ended_sessions(events, self.user_name_var.get())
+                self.start_sync()
+
+        if checkpoint_changed:
+            if self.engine.active_session:
+                self.checkpoint.write_session(self.engine.active_session)
+            else:
+                self.checkpoint.clear()
+
+        if ended_by_inactivity:
+            self.task_entry.config(state=tk.NORMAL)
+            self.task_var.set("")
+            messagebox.showinfo("Notification", "Session ended automatically due to inactivity.")
+
     def save_config(self):
         USER_DATA_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -112,6 +258,7 @@ class TimeTickItApp:
         # Account Menu
         account_menu = tk.Menu(menubar, tearoff=0)
         account_menu.add_command(label="See Record", command=self.show_record)
+        account_menu.add_command(label="Import History...", command=self.import_history)
         menubar.add_cascade(label="Account", menu=account_menu)
 
         # Help Menu
@@ -128,6 +275,45 @@ class TimeTickItApp:
     def open_about(self):
         webbrowser.open("https://github.com/ccstack27/TimeTickIt/blob/main/docs/00_about.md")
 
+    def import_history(self):
+        """
+        Imports past timesheets (CSV or JSON Lines) into the history store.
+        Rejected rows are listed in a CSV written next to the imported file.
+        """
+        file_path = filedialog.askopenfilename(
+            filetypes=[("Timesheets", "*.csv *.jsonl *.ndjson"), ("All files", "*.*")]
+        )
+        if not file_path:
+            return
+
+        rejects_path = Path(file_path).with_name(Path(file_path).stem + "_rejects.csv")
+        history = SessionHistory(HISTORY_FILE)
+        try:
+            report = import_sessions(
+                Path(file_path), history,
+                existing_sessions=self.engine.completed_sessions,
+                rejects_path=rejects_path,
+                ledger=self.ledger,
+            )
+        except (OSError, ValueError, sqlite3.Error) as e:
+            # Batches written before the error stay imported; importing the file again skips them.
+            messagebox.showerror("Import Error", f"Failed to import history: {str(e)}")
+            return
+        finally:
+            history.close()
+
+        summary = (
+            f"Rows read: {report.rows_read}\n"
+            f"Imported: {report.imported}\n"
+            f"Duplicates skipped: {report.duplicates}\n"
+            f"Rejected: {report.rejected}"
+        )
+        if report.rejected:
+            summary += f"\n\nRejected rows are listed in:\n{rejects_path}"
+        else:
+            rejects_path.unlink(missing_ok=True)
+        messagebox.showinfo("Import History", summary)
+
     def show_record(self):
         record_window = tk.Toplevel(self.root)
         record_window.title("Account Record")
@@ -176,6 +362,23 @@ class TimeTickItApp:
 
         tk.Label(record_window, text=f"Accumulated Session Time: {total_time_str}", font=("Helvetica", 10, "bold")).pack(pady=10)
 
+        # Imported timesheets are shown as a summary; they can be large and are never invoiced.
+        if HISTORY_FILE.exists():
+            history = SessionHistory(HISTORY_FILE)
+            try:
+                imported_count, imported_seconds = history.summary()
+            finally:
+                history.close()
+            if imported_count:
+                imported_hours, imported_remainder = divmod(imported_seconds, 3600)
+                imported_minutes, imported_seconds_final = divmod(imported_remainder, 60)
+                tk.Label(
+                    record_window,
+                    text=f"Imported History: {imported_count} sessions, "
+                         f"{imported_hours:02d}:{imported_minutes:02d}:{imported_seconds_final:02d}",
+                    font=("Helvetica", 9),
+                ).pack(pady=(0, 10))
+
     def setup_ui(self):
         self.root.columnconfigure(0, weight=1)
         
@@ -239,6 +442,9 @@ class TimeTickItApp:
         
         self.stop_btn = tk.Button(control_frame, text="Stop", font=("Arial", 14), command=self.stop_session, height=2, width=11)
         self.stop_btn.grid(row=0, column=1, padx=5)
+
+        self.switch_btn = tk.Button(control_frame, text="Switch Task", font=("Arial", 9), command=self.switch_task, width=37)
+        self.switch_btn.grid(row=1, column=0, columnspan=2, pady=(5, 0))
         
         # Output Trigger
         self.output_btn = tk.Button(self.root, text="Generate Invoice", font=("Arial", 9), command=self.generate_output, width=37)
@@ -264,25 +470,57 @@ class TimeTickItApp:
 
     def start_session(self):
         self.engine.start_session(task=self.task_var.get())
+        self.engine.dispatch_events()
         self.task_entry.config(state=tk.DISABLED)
 
     def stop_session(self):
         self.engine.stop_session()
         self.task_entry.config(state=tk.NORMAL)
         self.task_var.set("")
-        self.save_config()
+        self.engine.dispatch_events()
+
+    def switch_task(self):
+        """
+        Ends the active session and starts the next task at the same moment,
+        persisted with a single config write.
+        """
+        task = simpledialog.askstring("Switch Task", "Next task:", parent=self.root)
+        if task is None:
+            return
+
+        self.engine.switch_task(task)
+        self.task_var.set(task)
+        self.engine.dispatch_events()
 
     def generate_output(self):
+        try:
+            self.finish_pending_invoice()
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Output Error", f"A previous export could not be archived: {str(e)}")
+            return
+
         if not self.engine.completed_sessions:
             messagebox.showinfo("Output", "No completed sessions to include in output.")
             return
             
-        filename = f"TimeTickIt_Output_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        export_time = datetime.now()
+        invoice_id = self.ledger.next_invoice_id(export_time)
+        filename = f"TimeTickIt_Output_{export_time.strftime('%Y%m%d_%H%M%S')}.zip"
         file_path = filedialog.asksaveasfilename(defaultextension=".zip", initialfile=filename)
         
         if file_path:
+            # Invoiced sessions move from the hot set in config.json to the ledger.
+            # The export is recorded before the package is written, so whatever point a
+            # crash interrupts it at, finish_pending_invoice() bills the sessions once.
+            session_count = len(self.engine.completed_sessions)
+            self.config["pending_invoice"] = {
+                "invoice_id": invoice_id,
+                "session_count": session_count,
+                "package_path": file_path,
+            }
+            self.save_config()
             try:
-                # Add user name to session tasks or pass separately? 
+                # Add user name to session tasks or pass separately?
                 # The doc says user name is used in output files.
                 # Let's assume OutputGenerator could use it if we passed it.
                 # For now I'll just generate with current data.
@@ -290,28 +528,108 @@ class TimeTickItApp:
                     self.engine.completed_sessions, 
                     file_path, 
                     user_name=self.user_name_var.get(),
-                    hourly_rate=self.config.get("hourly_rate", 0.0)
+                    hourly_rate=self.config.get("hourly_rate", 0.0),
+                    invoice_id=invoice_id
                 )
-                self.engine.completed_sessions = []
-                self.save_config()
-                messagebox.showinfo("Output", f"Output package generated successfully at:\n{file_path}")
             except Exception as e:
+                del self.config["pending_invoice"]
+                self.save_config()
                 messagebox.showerror("Output Error", f"Failed to generate output: {str(e)}")
+                return
 
-    def update_loop(self):
-        # Tick the engine
-        old_state = self.engine.state
-        self.engine.tick()
-        
-        # Check for auto-end
-        if old_state == SystemState.ACTIVE and self.engine.state == SystemState.IDLE:
-            # Check why it ended
-            last_session = self.engine.completed_sessions[-1] if self.engine.completed_sessions else None
-            if last_session and last_session.end_reason == SessionEndReason.INACTIVITY_LIMIT:
-                messagebox.showinfo("Notification", "Session ended automatically due to inactivity.")
-                self.task_entry.config(state=tk.NORMAL)
-                self.task_var.set("")
+            try:
+                self.ledger.seal(invoice_id, self.engine.completed_sessions[:session_count], sealed_at=export_time)
+            except (OSError, ValueError) as e:
+                # The package exists, so the marker stays and sealing is retried later.
+                messagebox.showerror(
+                    "Output Error",
+                    f"Output package generated at:\n{file_path}\n\nbut its sessions could not be archived yet: {str(e)}"
+                )
+                return
+
+            self._invoiced_today = None
+            self.engine.completed_sessions = self.engine.completed_sessions[session_count:]
+            del self.config["pending_invoice"]
             self.save_config()
+            try:
+                self.ledger.compact()
+            except OSError:
+                # The export is complete; compaction only tidies closed months and runs again next export.
+                pass
+            messagebox.showinfo("Output", f"Output package generated successfully at:\n{file_path}")
+
+    def invoiced_today_seconds(self, today):
+        """
+        Session time started today that was already moved to the ledger by an export.
+        Read from the ledger once per day and after each export, not on every tick.
+        """
+        if self._invoiced_today is None or self._invoiced_today[0] != today:
+            day_start = datetime.combine(today, datetime.min.time())
+            try:
+                total = sum(
+                    s.get_duration_seconds()
+                    for _, s in self.ledger.query_period(day_start, day_start + timedelta(days=1))
+                )
+            except (OSError, ValueError, KeyError):
+                # The status total is display-only; an unreadable ledger leaves it at the
+                # uninvoiced time until the next day or export rather than failing the tick.
+                total = 0
+            self._invoiced_today = (today, total)
+        return self._invoiced_today[1]
+
+    def publish_status(self, now):
+        """
+        Mirrors the current state into the shared status block for external readers.
+        Today's total is display-only: it covers sessions started today, whether invoiced
+        or not, plus the elapsed time of the active session.
+        """
+        today = now.date()
+        today_total_seconds = self.invoiced_today_seconds(today) + sum(
+            s.get_duration_seconds() for s in self.engine.completed_sessions if s.start_time.date() == today
+        )
+
+        session = self.engine.active_session
+        if self.engine.state == SystemState.ACTIVE and session:
+            if session.start_time.date() == today:
+                today_total_seconds += int((now - session.start_time).total_seconds())
+            self.status_block.publish(
+                STATE_ACTIVE,
+                task=session.task,
+                session_start=session.start_time,
+                inactivity_seconds=self.engine.inactivity_timer_seconds,
+                max_inactivity_seconds=MAX_INACTIVITY_SECONDS,
+                today_total_seconds=today_total_seconds,
+                updated_at=now,
+            )
+        else:
+            self.status_block.publish(
+                STATE_IDLE,
+                max_inactivity_seconds=MAX_INACTIVITY_SECONDS,
+                today_total_seconds=today_total_seconds,
+                updated_at=now,
+            )
+
+    def update_loop(self):
+        # Rescheduled first, so an error in this tick cannot stop the ticks that follow.
+        self.root.after(1000, self.update_loop)
+
+        # Tick the engine; auto-ends are handled by on_engine_events
+        now = datetime.now()
+        self.engine.tick(current_time=now)
+        self.engine.dispatch_events()
+
+        if self.engine.state == SystemState.ACTIVE:
+            # The last activity is when the inactivity timer last started counting,
+            # so idle time before a crash is not billed.
+            last_activity_time = now - timedelta(seconds=self.engine.inactivity_timer_seconds)
+            self.checkpoint.touch(max(last_activity_time, self.engine.active_session.start_time))
+        try:
+            self.publish_status(now)
+        except (OSError, ValueError):
+            # The status block is optional; the core tick must go on without it.
+            pass
+        if self.sync_uploader and self.sync_uploader.retry_due():
+            self.start_sync()
 
         # Update UI elements
         self.state_label.config(text=f"STATE: {self.engine.state.name}")
@@ -327,9 +645,10 @@ class TimeTickItApp:
         if self.engine.state == SystemState.ACTIVE:
             self.start_btn.config(state=tk.DISABLED)
             self.stop_btn.config(state=tk.NORMAL)
+            self.switch_btn.config(state=tk.NORMAL)
             
             s = self.engine.active_session
-            elapsed = int((datetime.now() - s.start_time).total_seconds())
+            elapsed = int((now - s.start_time).total_seconds())
             hours, remainder = divmod(elapsed, 3600)
             minutes, seconds = divmod(remainder, 60)
             elapsed_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
@@ -338,9 +657,8 @@ class TimeTickItApp:
             self.timing_info_label.config(text=f"Session Start: {start_str} | Elapsed: {elapsed_str}")
             
             # Inactivity feedback
-            # Show countdown only after passing 3 minutes (remaining < 3 mins)
-            # 5:00 - 3:00 = 2:00 (120 seconds)
-            if self.engine.inactivity_timer_seconds > 120:
+            # Show countdown only after passing 2 minutes of inactivity (remaining < 3 mins)
+            if self.engine.inactivity_timer_seconds > INACTIVITY_WARNING_SECONDS:
                 remaining = MAX_INACTIVITY_SECONDS - self.engine.inactivity_timer_seconds
                 mins, secs = divmod(remaining, 60)
                 self.inactivity_label.config(text=f"No activity detected — session will end in {mins:02d}:{secs:02d}")
@@ -349,16 +667,19 @@ class TimeTickItApp:
         else:
             self.start_btn.config(state=tk.NORMAL)
             self.stop_btn.config(state=tk.DISABLED)
+            self.switch_btn.config(state=tk.DISABLED)
             self.timing_info_label.config(text="No active session")
             self.inactivity_label.config(text="")
 
-        self.root.after(1000, self.update_loop)
-
     def on_closing(self):
         self.mouse_listener.stop()
         self.key_listener.stop()
         self.engine.handle_interruption()
+        self.engine.dispatch_events()
         self.save_config()
+        self.checkpoint.clear()
+        self.checkpoint.close()
+        self.status_block.close()
         self.root.destroy()
 
 if __name__ == "__main__":